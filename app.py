@@ -7,6 +7,18 @@ from state import initialize_session_state, update_generated_scripts
 from utils import generate_jwt_secret
 from generators import generate_all_scripts
 import ui
+
+# Main navigation labels, in display order
+TAB_LABELS = (
+    "Basic Resources", 
+    "API Management",
+    "Networking", 
+    "App Service", 
+    "Data & AI", 
+    "Teams Integration",
+    "CI/CD Pipeline",
+    "Deployment Checklist"
+)
     
 def main():
     """Main application entry point with updated tab order and export/import functionality"""
@@ -20,45 +32,39 @@ def main():
     sidebar_values = ui.create_sidebar()
     st.session_state.sidebar_values = sidebar_values
     
-    # Create main tabs - updated to include CI/CD tab
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
-        "Basic Resources", 
-        "API Management",
-        "Networking", 
-        "App Service", 
-        "Data & AI", 
-        "Teams Integration",
-        "CI/CD Pipeline",
-        "Deployment Checklist"
-    ])
+    # Main tab navigation - updated to include CI/CD tab. Only the active tab is
+    # rendered; each tab keeps its values in st.session_state.tab_settings.
+    active_tab = st.radio(
+        "Section",
+        TAB_LABELS,
+        key="active_tab",
+        horizontal=True,
+        label_visibility="collapsed"
+    )
     
-    # Populate the tabs with input fields
-    with tab1:
-        basic_resources = ui.create_basic_resources_tab()
+    # Populate the active tab with input fields
+    if active_tab == "Basic Resources":
+        ui.create_basic_resources_tab()
     
-    with tab2:
-        api_management = ui.create_api_management_tab()
+    elif active_tab == "API Management":
+        ui.create_api_management_tab()
     
-    with tab3:
-        networking = ui.create_networking_tab()
-        # Add ARM template generator in the networking tab
-        env = sidebar_values.get('env', 'dev')
-        location = sidebar_values.get('location', 'japaneast')
-        ui.create_arm_template_section(networking, env, location)
+    elif active_tab == "Networking":
+        ui.create_networking_tab()
     
-    with tab4:
-        app_service = ui.create_app_service_tab()
+    elif active_tab == "App Service":
+        ui.create_app_service_tab()
     
-    with tab5:
-        data_ai = ui.create_data_ai_tab()
+    elif active_tab == "Data & AI":
+        ui.create_data_ai_tab()
     
-    with tab6:
-        teams_integration = ui.create_teams_integration_tab()
+    elif active_tab == "Teams Integration":
+        ui.create_teams_integration_tab()
         
-    with tab7:
-        cicd = ui.create_cicd_tab()
+    elif active_tab == "CI/CD Pipeline":
+        ui.create_cicd_tab()
     
-    with tab8:
+    elif active_tab == "Deployment Checklist":
         ui.create_deployment_checklist_tab()
     
     # Create a button area with a more prominent design for generating commands
@@ -98,6 +104,13 @@ def main():
             # Make sure we have the latest values from all sources
             sidebar_values = st.session_state.sidebar_values
             jwt_secret = st.session_state.get('jwt_secret_key', '')
+            # Tabs are fragments, so read their values from session state rather than return values.
+            # Tabs that were never opened have nothing saved and fall back to their defaults.
+            default_settings = ui.compute_default_tab_settings(sidebar_values.get('env', 'dev'))
+            tab_settings = {
+                tab_name: {**defaults, **st.session_state.tab_settings.get(tab_name, {})}
+                for tab_name, defaults in default_settings.items()
+            }
             
             # Create a comprehensive params dictionary with all required parameters
             params = {
@@ -115,12 +128,12 @@ def main():
                 'jwt_secret_key': jwt_secret,
                 
                 # Settings from all tabs
-                **basic_resources,
-                **networking,
-                **app_service,
-                **data_ai,
-                **api_management,
-                **teams_integration
+                **tab_settings['basic_resources'],
+                **tab_settings['networking'],
+                **tab_settings['app_service'],
+                **tab_settings['data_ai'],
+                **tab_settings['api_management'],
+                **tab_settings['teams_integration']
             }
             
             # Generate all scripts
@@ -2,7 +2,7 @@
 Script generator functions for Azure infrastructure components.
 This module contains functions to generate various Azure CLI scripts.
 """
-from datetime import datetime
+import time
 
 def generate_environment_vars(env, subscription_id, location, rg_name, 
                               anpi_tag, shared_tag, ms_app_id, ms_app_password, 
@@ -974,7 +974,7 @@ def generate_complete_script(env, env_vars, resource_group, api_management, netw
     """Generate complete deployment script with reordered sections"""
     return f"""#!/bin/bash
 # Azure ANPI Bot Deployment Script
-# Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+# Generated on {time.strftime('%Y-%m-%d %H:%M:%S')}
 # For environment: {env}
 
 {env_vars}
@@ -1006,6 +1006,7 @@ def generate_all_scripts(params):
     """Generate all script sections based on input parameters with APIM first, then Application Gateway"""
     # Extract environment value first to use consistently
     env = params['env']
+    env_cap = env.capitalize()
     
     # Generate individual sections
     env_vars = generate_environment_vars(
@@ -1013,8 +1014,8 @@ def generate_all_scripts(params):
         params['subscription_id'],
         params['location'],
         params['rg_name'],
-        params['anpi_tag'].replace('Dev', env.capitalize()),  # Fix tags to use correct environment
-        params['shared_tag'].replace('Dev', env.capitalize()), # Fix tags to use correct environment
+        params['anpi_tag'].replace('Dev', env_cap),  # Fix tags to use correct environment
+        params['shared_tag'].replace('Dev', env_cap), # Fix tags to use correct environment
         params['ms_app_id'],
         params['ms_app_password'],
         params['ms_app_tenant_id'],
@@ -1040,7 +1041,7 @@ def generate_all_scripts(params):
     search_name = params['search_name'].replace('dev', env.lower())
     app_name = params['app_name'].replace('dev', env.lower())
     bot_name = params['bot_name'].replace('dev', env.lower())
-    teams_app_name = params['teams_app_name'].replace('Dev', env.capitalize())
+    teams_app_name = params['teams_app_name'].replace('Dev', env_cap)
     
     # Create API Management first
     api_mgmt = generate_api_management(
@@ -2,8 +2,20 @@
 State management for the Streamlit application.
 This module initializes and manages the application's session state.
 """
+import json
+import os
+import re
+import shutil
+import time
+import uuid
 import streamlit as st
 
+# Directory holding per-session checklist progress, one JSON file per checklist group;
+# set ANPI_CHECKLIST_STATE_DIR to keep it outside the app directory
+CHECKLIST_STATE_DIR = os.environ.get('ANPI_CHECKLIST_STATE_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), '.checklist_state')
+# Session directories not saved to for this many seconds are removed
+CHECKLIST_STATE_MAX_AGE = 30 * 24 * 60 * 60
+
 def initialize_session_state():
     """Initialize all required session state variables"""
     
@@ -31,7 +43,7 @@ def initialize_session_state():
         st.session_state['script_generated'] = False
 
     if 'checklist_state' not in st.session_state:
-        st.session_state['checklist_state'] = {}
+        st.session_state['checklist_state'] = load_checklist_state(get_session_id())
         
     # JWT key state
     if 'jwt_secret_key' not in st.session_state:
@@ -85,14 +97,17 @@ def save_tab_settings(tab_name, settings_dict):
     """
     Save settings for a specific tab to session state
     
+    Does nothing when the tab's saved settings already equal settings_dict.
+    
     Args:
         tab_name (str): The name of the tab (e.g., 'basic_resources', 'networking')
         settings_dict (dict): Dictionary containing the tab's settings
     """
-    if 'tab_settings' not in st.session_state:
-        st.session_state['tab_settings'] = {}
+    tab_settings = st.session_state.setdefault('tab_settings', {})
+    if tab_settings.get(tab_name) == settings_dict:
+        return
     
-    st.session_state['tab_settings'][tab_name] = settings_dict
+    tab_settings[tab_name] = settings_dict
     
 def load_tab_settings(tab_name):
     """
@@ -104,10 +119,8 @@ def load_tab_settings(tab_name):
     Returns:
         dict: The saved settings for the tab or an empty dict if none exist
     """
-    if 'tab_settings' not in st.session_state or tab_name not in st.session_state['tab_settings']:
-        return {}
-    
-    return st.session_state['tab_settings'][tab_name]
+    # A single session state read; st.cache_data is shared across sessions, so it can't hold these
+    return st.session_state.get('tab_settings', {}).get(tab_name, {})
     
 def get_all_settings():
     """
@@ -116,13 +129,14 @@ def get_all_settings():
     Returns:
         dict: Complete settings dictionary with all tabs' settings
     """
-    if 'tab_settings' not in st.session_state:
-        st.session_state['tab_settings'] = {}
-        
+    # Read each session state entry once; every proxy access has its own lookup cost
+    tab_settings = st.session_state.setdefault('tab_settings', {})
+    sidebar_values = st.session_state.get('sidebar_values', {})
+
     # Combine all settings
     all_settings = {
-        'sidebar': st.session_state.get('sidebar_values', {}),
-        'tabs': st.session_state['tab_settings']
+        'sidebar': sidebar_values,
+        'tabs': tab_settings
     }
     
     return all_settings
@@ -140,4 +154,96 @@ def load_all_settings(settings_dict):
         
     # Update tab settings
     if 'tabs' in settings_dict:
-        st.session_state['tab_settings'] = settings_dict['tabs']
\ No newline at end of file
+        st.session_state['tab_settings'] = settings_dict['tabs']
+
+def get_session_id():
+    """
+    Get a stable identifier for the current user session
+    
+    The identifier is kept in the URL query parameters so that it survives
+    browser reloads and Streamlit session restarts.
+    
+    Returns:
+        str: Hex session identifier
+    """
+    if '_session_id' not in st.session_state:
+        session_id = st.query_params.get('sid', '')
+        # Only accept identifiers we could have generated; they are used in file paths
+        if not re.fullmatch(r'[0-9a-f]{32}', session_id):
+            session_id = uuid.uuid4().hex
+            st.query_params['sid'] = session_id
+        st.session_state['_session_id'] = session_id
+    
+    return st.session_state['_session_id']
+
+def load_checklist_state(session_id):
+    """
+    Load persisted checklist progress for a session from disk
+    
+    Args:
+        session_id (str): The session identifier from get_session_id()
+        
+    Returns:
+        dict: Check ids mapped to booleans, empty if nothing was saved
+    """
+    session_dir = os.path.join(CHECKLIST_STATE_DIR, session_id)
+    checklist_state = {}
+    if not os.path.isdir(session_dir):
+        return checklist_state
+    
+    for file_name in os.listdir(session_dir):
+        group, ext = os.path.splitext(file_name)
+        if ext != '.json':
+            continue
+        try:
+            with open(os.path.join(session_dir, file_name), 'r') as f:
+                group_state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        checklist_state.update(group_state)
+    
+    return checklist_state
+
+def save_checklist_group(group, check_ids):
+    """
+    Write a single checklist group of the current session to disk
+    
+    Args:
+        group (str): The checklist group key (e.g., 'setup_checks'), used as the file name
+        check_ids (tuple): The check ids belonging to the group
+    """
+    checklist_state = st.session_state['checklist_state']
+    group_state = {check_id: checklist_state.get(check_id, False) for check_id in check_ids}
+    session_dir = os.path.join(CHECKLIST_STATE_DIR, get_session_id())
+    try:
+        if not os.path.isdir(session_dir):
+            # First save of this session; a good moment to clear out abandoned ones
+            prune_checklist_state()
+            os.makedirs(session_dir, exist_ok=True)
+        with open(os.path.join(session_dir, f'{group}.json'), 'w') as f:
+            json.dump(group_state, f)
+        # Rewriting a file leaves the directory time alone, so mark the session as active
+        os.utime(session_dir)
+    except OSError:
+        # Persistence is best effort; the in-memory state is still up to date
+        pass
+
+def prune_checklist_state(max_age=CHECKLIST_STATE_MAX_AGE):
+    """
+    Remove the saved checklist progress of sessions that have been inactive too long
+    
+    Args:
+        max_age (int): Seconds since the last save after which a session directory is removed
+    """
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(CHECKLIST_STATE_DIR))
+    except OSError:
+        return
+    
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except OSError:
+            continue
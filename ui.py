@@ -1,19 +1,51 @@
 """
 UI components for the Streamlit application.
 """
-from datetime import datetime
+import codecs
+import functools
 import json
+import time
+import orjson
 import streamlit as st
-from utils import generate_azure_pipeline_yaml, get_apim_policy_xml, get_initial_knowledge_json, get_json_download_link, get_markdown_download_link, generate_jwt_secret, create_markdown_content, get_postman_collection_download_link, get_search_datasource_json, get_search_index_json, get_search_indexer_json, get_settings_download_link, get_swagger_json_download_link, get_teams_app_manifest_download_link, get_xml_download_link, get_yaml_download_link, parse_uploaded_settings, get_full_settings_download_link
-from state import load_tab_settings, save_tab_settings, update_jwt_secret
+from utils import generate_azure_pipeline_yaml, get_apim_policy_xml, get_arm_template_download_link, get_initial_knowledge_json, get_json_download_link, generate_jwt_secret, create_markdown_content, get_postman_collection_download_link, get_search_datasource_json, get_search_index_json, get_search_indexer_json, get_settings_json, get_swagger_json_download_link, get_teams_app_manifest_download_link, get_openapi_yaml, get_xml_download_link, parse_uploaded_settings
+from state import get_all_settings, load_all_settings, load_tab_settings, save_checklist_group, save_tab_settings, update_jwt_secret
+
+# Immutable option lists shared by all sessions
+_ENV_CHOICES = ("dev", "test", "preprd", "prod")
+_REGIONS = ("japaneast", "eastus", "westus", "northeurope", "southeastasia")
+_ASP_SKUS = ("B1", "S1", "P1V2", "P2V2", "P3V2")
+_RUNTIMES = ("DOTNETCORE|6.0", "DOTNETCORE|7.0", "DOTNETCORE|8.0", "NODE|14-lts", "NODE|16-lts")
+_OPENAI_REGIONS = ("japaneast", "eastus", "southeastasia")
+_OPENAI_MODELS = ("gpt-4o-mini", "gpt-4o", "gpt-35-turbo", "gpt-4")
+_SEARCH_SKUS = ("Basic", "Standard", "Standard2", "Standard3")
+_APIM_SKUS = ("Consumption", "Developer", "Basic", "Standard", "Premium")
+
+# Option -> position lookups for the selectbox index arguments
+_ENV_IDX = {value: i for i, value in enumerate(_ENV_CHOICES)}
+_REGION_IDX = {value: i for i, value in enumerate(_REGIONS)}
+_ASP_SKU_IDX = {value: i for i, value in enumerate(_ASP_SKUS)}
+_RUNTIME_IDX = {value: i for i, value in enumerate(_RUNTIMES)}
+_OPENAI_REGION_IDX = {value: i for i, value in enumerate(_OPENAI_REGIONS)}
+_OPENAI_MODEL_IDX = {value: i for i, value in enumerate(_OPENAI_MODELS)}
+_SEARCH_SKU_IDX = {value: i for i, value in enumerate(_SEARCH_SKUS)}
+_APIM_SKU_IDX = {value: i for i, value in enumerate(_APIM_SKUS)}
+
+# Default CORS origins for the API Management tab, parsed once at import
+_DEFAULT_ALLOWED_ORIGINS_JSON = '["https://*.fjpservice.net","https://localhost:4200"]'
+_DEFAULT_ALLOWED_ORIGINS = json.loads(_DEFAULT_ALLOWED_ORIGINS_JSON)
+
+@st.cache_resource(show_spinner=False)
+def _load_css():
+    """Read the custom stylesheet once per process"""
+    with open('style.css', 'r') as f:
+        return f.read()
 
 def configure_page():
     """Configure the Streamlit page settings with custom CSS"""
     st.set_page_config(page_title="Azure ANPI Bot Infrastructure Generator", layout="wide")
     
     # Load custom CSS from file
-    with open('style.css', 'r') as f:
-        css = f.read()
+    css = _load_css()
     
     # Apply custom styling
     st.markdown(f'<style>{css}</style>', unsafe_allow_html=True)
@@ -21,17 +53,21 @@ def configure_page():
     st.title("Azure ANPI Bot Infrastructure Deployment Generator")
     st.markdown("This tool helps you generate Azure CLI commands for deploying the ANPI Bot infrastructure. Fill in the parameters below and copy the generated commands.")
     
-    # Add info about export/import functionality
-    st.info("""
-    💾 **Export/Import Settings**: You can export and import settings from each tab or the entire application.
-    - Use the 'Export Tab Settings' button in each tab to save current tab settings
-    - Use the 'Import Tab Settings' button to load saved settings for a specific tab
-    - Use the sidebar's 'Export/Import Settings' section to save/load all application settings
-    """)
+    # Add info about export/import functionality, collapsed by default
+    with st.expander("💾 Export/Import Help", expanded=False):
+        st.markdown("""
+        You can export and import settings from each tab or the entire application.
+        - Use the 'Export Tab Settings' button in each tab to save current tab settings
+        - Use the 'Import Tab Settings' button to load saved settings for a specific tab
+        - Use the sidebar's 'Export/Import Settings' section to save/load all application settings
+        """)
     
 
 def create_sidebar():
     """Create and configure the sidebar with environment settings and export/import functionality"""
+    # Previously applied sidebar values, read from session state once
+    sv = st.session_state.get('sidebar_values') or {}
+    
     with st.sidebar:
         st.header("Environment Settings")
         
@@ -39,113 +75,122 @@ def create_sidebar():
         with st.expander("Export/Import Settings", expanded=False):
             # Export all settings (complete application settings)
             if st.button("Export All Settings", key="export_all_settings_sidebar"):
-                from state import get_all_settings
                 # Get all settings from session state
                 all_settings = get_all_settings()
                 
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                download_link = get_full_settings_download_link(
-                    all_settings, 
-                    f"anpi_full_settings_{timestamp}.json"
+                timestamp = time.strftime("%Y%m%d_%H%M%S")
+                st.download_button(
+                    label="Download Complete Settings",
+                    data=get_settings_json(all_settings),
+                    file_name=f"anpi_full_settings_{timestamp}.json",
+                    mime="application/json",
+                    key="download_all_settings_sidebar"
                 )
-                st.markdown(download_link, unsafe_allow_html=True)
                 st.success("All settings exported successfully!")
             
             # Export just environment settings (legacy support)
             if st.button("Export Environment Settings"):
-                if 'sidebar_values' in st.session_state:
+                if sv:
                     # Combine environment and bot settings
                     export_settings = {
                         'environment': {
-                            'env': st.session_state.sidebar_values.get('env', 'dev'),
-                            'subscription_id': st.session_state.sidebar_values.get('subscription_id', ''),
-                            'location': st.session_state.sidebar_values.get('location', 'japaneast')
+                            'env': sv.get('env', 'dev'),
+                            'subscription_id': sv.get('subscription_id', ''),
+                            'location': sv.get('location', 'japaneast')
                         },
                         'bot': {
-                            'ms_app_id': st.session_state.sidebar_values.get('ms_app_id', ''),
-                            'ms_app_password': st.session_state.sidebar_values.get('ms_app_password', ''),
-                            'ms_app_tenant_id': st.session_state.sidebar_values.get('ms_app_tenant_id', '')
+                            'ms_app_id': sv.get('ms_app_id', ''),
+                            'ms_app_password': sv.get('ms_app_password', ''),
+                            'ms_app_tenant_id': sv.get('ms_app_tenant_id', '')
                         }
                     }
                     
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    download_link = get_settings_download_link(
-                        export_settings, 
-                        f"anpi_env_settings_{timestamp}.json"
+                    timestamp = time.strftime("%Y%m%d_%H%M%S")
+                    st.download_button(
+                        label="Download Settings",
+                        data=get_settings_json(export_settings),
+                        file_name=f"anpi_env_settings_{timestamp}.json",
+                        mime="application/json",
+                        key="download_env_settings"
                     )
-                    st.markdown(download_link, unsafe_allow_html=True)
                 else:
                     st.warning("No settings available to export")
             
             # Import settings
             st.write("Import Settings:")
-            uploaded_file = st.file_uploader("Choose a settings file", type=["json"])
+            uploaded_file = st.file_uploader("Choose a settings file", type=["json"], key="sidebar_settings_uploader")
             if uploaded_file is not None:
                 settings = parse_uploaded_settings(uploaded_file)
                 if settings:
                     if st.button("Apply Imported Settings"):
-                        # Detect the settings format
+                        # Detect the settings format; a file matching the current settings needs no rerun,
+                        # while re-applying it after further edits still reverts them
                         if 'sidebar' in settings and 'tabs' in settings:
                             # New format (complete settings)
-                            from state import load_all_settings
-                            load_all_settings(settings)
-                            st.success("All settings imported successfully!")
-                            st.rerun()
+                            current_settings = get_all_settings()
+                            if settings['sidebar'] == current_settings['sidebar'] and settings['tabs'] == current_settings['tabs']:
+                                st.info("These settings are already in use.")
+                            else:
+                                load_all_settings(settings)
+                                _reset_form_widgets(*TAB_FORM_SPEC)
+                                st.success("All settings imported successfully!")
+                                st.rerun()
                         elif 'environment' in settings or 'bot' in settings:
                             # Old format (just environment settings)
-                            # Create sidebar_values if it doesn't exist
-                            if 'sidebar_values' not in st.session_state:
-                                st.session_state.sidebar_values = {}
+                            imported_values = {}
                             
-                            # Update environment settings
+                            # Environment settings
                             if 'environment' in settings:
                                 env_settings = settings['environment']
-                                st.session_state.sidebar_values['env'] = env_settings.get('env', 'dev')
-                                st.session_state.sidebar_values['subscription_id'] = env_settings.get('subscription_id', '')
-                                st.session_state.sidebar_values['location'] = env_settings.get('location', 'japaneast')
+                                imported_values['env'] = env_settings.get('env', 'dev')
+                                imported_values['subscription_id'] = env_settings.get('subscription_id', '')
+                                imported_values['location'] = env_settings.get('location', 'japaneast')
                             
-                            # Update bot settings
+                            # Bot settings
                             if 'bot' in settings:
                                 bot_settings = settings['bot']
-                                st.session_state.sidebar_values['ms_app_id'] = bot_settings.get('ms_app_id', '')
-                                st.session_state.sidebar_values['ms_app_password'] = bot_settings.get('ms_app_password', '')
-                                st.session_state.sidebar_values['ms_app_tenant_id'] = bot_settings.get('ms_app_tenant_id', '')
-                            
-                            st.success("Environment settings imported successfully!")
-                            st.rerun()
+                                imported_values['ms_app_id'] = bot_settings.get('ms_app_id', '')
+                                imported_values['ms_app_password'] = bot_settings.get('ms_app_password', '')
+                                imported_values['ms_app_tenant_id'] = bot_settings.get('ms_app_tenant_id', '')
+
+                            if all(sv.get(key) == value for key, value in imported_values.items()):
+                                st.info("These settings are already in use.")
+                            else:
+                                # Create sidebar_values if it doesn't exist
+                                st.session_state.setdefault('sidebar_values', {}).update(imported_values)
+                                st.success("Environment settings imported successfully!")
+                                st.rerun()
                         else:
                             st.error("Unknown settings format. Please use a valid settings file.")
                 else:
                     st.error("Failed to parse the uploaded file. Please ensure it's a valid JSON file.")
         
         # Regular sidebar inputs
-        env = st.selectbox("Environment", ["dev", "test", "preprd", "prod"], 
-                          index=["dev", "test", "preprd", "prod"].index(
-                              st.session_state.sidebar_values.get('env', 'dev')) if 'sidebar_values' in st.session_state else 0)
+        env = st.selectbox("Environment", _ENV_CHOICES, 
+                          index=_ENV_IDX.get(sv.get('env', 'dev'), 0))
         
         subscription_id = st.text_input(
             "Azure Subscription ID", 
-            value=st.session_state.sidebar_values.get('subscription_id', 'your-subscription-id') if 'sidebar_values' in st.session_state else 'your-subscription-id')
+            value=sv.get('subscription_id', 'your-subscription-id'))
         
         location = st.selectbox(
             "Azure Region", 
-            ["japaneast", "eastus", "westus", "northeurope", "southeastasia"],
-            index=["japaneast", "eastus", "westus", "northeurope", "southeastasia"].index(
-                st.session_state.sidebar_values.get('location', 'japaneast')) if 'sidebar_values' in st.session_state else 0)
+            _REGIONS,
+            index=_REGION_IDX.get(sv.get('location', 'japaneast'), 0))
         
         st.header("Bot Settings")
         ms_app_id = st.text_input(
             "Bot App ID", 
-            value=st.session_state.sidebar_values.get('ms_app_id', 'your-bot-app-id') if 'sidebar_values' in st.session_state else 'your-bot-app-id')
+            value=sv.get('ms_app_id', 'your-bot-app-id'))
         
         ms_app_password = st.text_input(
             "Bot App Password", 
-            value=st.session_state.sidebar_values.get('ms_app_password', 'your-bot-app-password') if 'sidebar_values' in st.session_state else 'your-bot-app-password', 
+            value=sv.get('ms_app_password', 'your-bot-app-password'), 
             type="password")
         
         ms_app_tenant_id = st.text_input(
             "Tenant ID", 
-            value=st.session_state.sidebar_values.get('ms_app_tenant_id', 'your-tenant-id') if 'sidebar_values' in st.session_state else 'your-tenant-id')
+            value=sv.get('ms_app_tenant_id', 'your-tenant-id'))
         
         # Save values to sidebar_values dictionary
         sidebar_values = {
@@ -159,379 +204,441 @@ def create_sidebar():
         
         return sidebar_values
     
-def create_basic_resources_tab():
-    """Create the Basic Resources tab with export/import functionality"""
-    st.header("Resource Group and Basic Settings")
-    env = st.session_state.sidebar_values['env']
+def _build_default_names(env):
+    """
+    Build the environment-specific default resource names used across the tabs
     
-    # Add export/import functionality for this tab
-    col1, col2, col3 = st.columns([1, 1, 2])
-    with col1:
-        if st.button("Export Tab Settings", key="export_basic"):
-            # Get the current tab settings from session state or default values
-            from state import load_tab_settings
-            tab_settings = load_tab_settings('basic_resources')
-            if not tab_settings:
+    Args:
+        env (str): Environment (dev, test, etc.)
+        
+    Returns:
+        dict: Default names keyed by the tab setting they pre-fill
+    """
+    env_cap = env.capitalize()
+    return {
+        # Basic resources
+        'rg_name': f"itz-{env}-jpe-001",
+        'anpi_tag': f"Project=AnpiBot Environment={env_cap}",
+        'shared_tag': f"Environment={env_cap} Project=ITZ-Chatbot",
+        # Networking
+        'vnet_name': f"vnet-itz-{env}-jpe-001",
+        'subnet_name': f"snet-itz-{env}-jpe-001",
+        'pip_name': f"pip-itz-anpi-{env}-jpe-001",
+        'agw_name': f"agw-itz-{env}-jpe-001",
+        'waf_name': f"waf-itz-{env}-jpe-001",
+        # App Service
+        'asp_name': f"asp-itz-{env}-001",
+        'app_name': f"app-itz-anpi-{env}-001",
+        'appinsights_name': f"appi-itz-anpi-{env}-jpe-001",
+        'bot_name': f"bot-itz-anpi-{env}",
+        # Data & AI
+        'kv_name': f"kv-itz-{env}-jpe-001",
+        'cosmos_name': f"cosmos-itz-{env}",
+        'openai_name': f"oai-itz-{env}",
+        'search_name': f"srch-itz-{env}",
+        # Teams integration
+        'teams_app_name': f"ANPI Teams Bot {env_cap}",
+        'package_name': f"com.fjp.anpibot{env}",
+    }
+
+def _build_default_tab_settings(env):
+    """
+    Build the default settings of every tab, as they are shown before the user edits anything
+    
+    Tabs are only rendered while they are active, so script generation falls back to
+    these values for any tab the user never opened.
+    
+    Args:
+        env (str): Environment (dev, test, etc.)
+        
+    Returns:
+        dict: Default settings keyed by tab name, in the same shape save_tab_settings() stores
+    """
+    names = _build_default_names(env)
+    return {
+        'basic_resources': {
+            'rg_name': names['rg_name'],
+            'anpi_tag': names['anpi_tag'],
+            'shared_tag': names['shared_tag'],
+            'api_base_url': "https://api-test.fjpservice.net",
+            'timeout_minutes': 30,
+            'jwt_issuer': "https://api.botframework.com",
+            'jwt_expiry_minutes': 60,
+        },
+        'networking': {
+            'vnet_name': names['vnet_name'],
+            'vnet_address_prefix': "10.0.0.0/16",
+            'subnet_name': names['subnet_name'],
+            'subnet_prefix': "10.0.1.0/24",
+            'pip_name': names['pip_name'],
+            'agw_name': names['agw_name'],
+            'waf_name': names['waf_name'],
+        },
+        'app_service': {
+            'asp_name': names['asp_name'],
+            'asp_sku': "B1",
+            'app_name': names['app_name'],
+            'app_runtime': "DOTNETCORE|6.0",
+            'appinsights_name': names['appinsights_name'],
+            'bot_name': names['bot_name'],
+        },
+        'data_ai': {
+            'kv_name': names['kv_name'],
+            'cosmos_name': names['cosmos_name'],
+            'cosmos_db_name': "AnpiDb",
+            'openai_name': names['openai_name'],
+            'openai_region': "eastus",
+            'openai_model': "gpt-4o-mini",
+            'model_version': "2024-07-18",
+            'embedding_model': "text-embedding-ada-002",
+            'embedding_model_version': 2,
+            'search_name': names['search_name'],
+            'search_sku': "Basic",
+            'search_index_name': "anpi-knowledge",
+            'semantic_config_name': "my-semantic-config",
+        },
+        'api_management': {
+            'apim_name': "apim-itz-fjp",
+            'apim_sku': "Consumption",
+            'apim_publisher_email': "tuyendhq@fpt.com",
+            'apim_publisher_name': "FJP Japan Holding",
+            'api_id': "anpi-bot-api",
+            'api_path': "anpi",
+            'api_display_name': "ANPI Bot API",
+            'allowed_origins': _DEFAULT_ALLOWED_ORIGINS_JSON,
+        },
+        'teams_integration': {
+            'teams_app_name': names['teams_app_name'],
+            'teams_redirect_uri': "https://token.botframework.com/.auth/web/redirect",
+            'bot_id': "add0fcf1-3190-4a12-8ca0-00c47acb6178",
+            'package_name': names['package_name'],
+        },
+        'cicd': {
+            'project_url': "https://dev.azure.com/FJPFST/ANPI%20Teams%20Bot",
+            'repo_url': "https://FJPFST@dev.azure.com/FJPFST/ANPI%20Teams%20Bot/_git/ANPI%20Teams%20Bot",
+            'service_conn_name': "ANPI-Azure-Connection",
+            'env_dev': True,
+            'env_test': True,
+            'env_prod': True,
+        },
+    }
+
+# Defaults for every selectable environment, built once at import
+_DEFAULT_NAMES_BY_ENV = {env: _build_default_names(env) for env in _ENV_CHOICES}
+_DEFAULT_TAB_SETTINGS_BY_ENV = {env: _build_default_tab_settings(env) for env in _ENV_CHOICES}
+
+def compute_default_names(env):
+    """
+    Get the default resource names for an environment
+    
+    Args:
+        env (str): Environment (dev, test, etc.)
+        
+    Returns:
+        dict: Default names keyed by the tab setting they pre-fill; treat as read-only
+    """
+    return _DEFAULT_NAMES_BY_ENV.get(env) or _build_default_names(env)
+
+def compute_default_tab_settings(env):
+    """
+    Get the default settings of every tab for an environment
+    
+    Args:
+        env (str): Environment (dev, test, etc.)
+        
+    Returns:
+        dict: Default settings keyed by tab name; treat as read-only
+    """
+    return _DEFAULT_TAB_SETTINGS_BY_ENV.get(env) or _build_default_tab_settings(env)
+
+# Form fields per tab: (setting key, label, widget kind, extra widget arguments).
+# 'subheader' and 'info' rows only render their label.
+TAB_FORM_SPEC = {
+    'basic_resources': (
+        ('rg_name', "Resource Group Name", 'text', {}),
+        ('anpi_tag', "ANPI Tags", 'text', {}),
+        ('shared_tag', "Shared Tags", 'text', {}),
+        ('api_base_url', "API Base URL", 'text', {}),
+        ('timeout_minutes', "Timeout Minutes", 'number', {'min_value': 1, 'max_value': 60}),
+        ('jwt_issuer', "JWT Issuer", 'text', {}),
+        ('jwt_expiry_minutes', "JWT Expiry Minutes", 'number', {'min_value': 1, 'max_value': 1440}),
+    ),
+    'networking': (
+        ('vnet_name', "Virtual Network Name", 'text', {'key': "net_vnet_name"}),
+        ('vnet_address_prefix', "VNet Address Prefix", 'text', {'key': "net_vnet_prefix"}),
+        (None, "Subnets", 'subheader', {}),
+        ('subnet_name', "Subnet Name", 'text', {'key': "net_subnet_name"}),
+        ('subnet_prefix', "Subnet Address Prefix", 'text', {'key': "net_subnet_prefix"}),
+        (None, "Application Gateway", 'subheader', {}),
+        ('pip_name', "Public IP Name", 'text', {'key': "net_pip_name"}),
+        ('agw_name', "Application Gateway Name", 'text', {'key': "net_agw_name"}),
+        ('waf_name', "WAF Policy Name", 'text', {'key': "net_waf_name"}),
+    ),
+    'app_service': (
+        ('asp_name', "App Service Plan Name", 'text', {}),
+        ('asp_sku', "App Service Plan SKU", 'select', {'options': _ASP_SKUS, 'index_map': _ASP_SKU_IDX}),
+        ('app_name', "Web App Name", 'text', {}),
+        ('app_runtime', "App Runtime", 'select', {'options': _RUNTIMES, 'index_map': _RUNTIME_IDX}),
+        (None, "Application Insights", 'subheader', {}),
+        ('appinsights_name', "Application Insights Name", 'text', {}),
+        ('bot_name', "Bot Service Name", 'text', {}),
+    ),
+    'data_ai': (
+        (None, "Key Vault", 'subheader', {}),
+        ('kv_name', "Key Vault Name", 'text', {}),
+        (None, "Cosmos DB", 'subheader', {}),
+        ('cosmos_name', "Cosmos DB Account Name", 'text', {}),
+        ('cosmos_db_name', "Cosmos DB Database Name", 'text', {}),
+        (None, "Azure OpenAI", 'subheader', {}),
+        ('openai_name', "OpenAI Service Name", 'text', {}),
+        ('openai_region', "OpenAI Region", 'select', {
+            'options': _OPENAI_REGIONS, 'index_map': _OPENAI_REGION_IDX,
+            'help': "Azure OpenAI is only available in select regions. Choose one that supports the models you need."}),
+        ('openai_model', "OpenAI Model", 'select', {'options': _OPENAI_MODELS, 'index_map': _OPENAI_MODEL_IDX}),
+        (None, "Note: Not all models are available in all regions. GPT-4o models might only be available in East US.", 'info', {}),
+        ('model_version', "Model Version", 'text', {}),
+        ('embedding_model', "Embedding Model", 'text', {}),
+        ('embedding_model_version', "Embedding Model Version", 'number', {'min_value': 1}),
+        (None, "Azure Search", 'subheader', {}),
+        ('search_name', "Search Service Name", 'text', {}),
+        ('search_sku', "Search SKU", 'select', {'options': _SEARCH_SKUS, 'index_map': _SEARCH_SKU_IDX}),
+        ('search_index_name', "Search Index Name", 'text', {}),
+        ('semantic_config_name', "Semantic Config Name", 'text', {}),
+    ),
+    'api_management': (
+        ('apim_name', "API Management Name", 'text', {}),
+        ('apim_sku', "API Management SKU", 'select', {'options': _APIM_SKUS, 'index_map': _APIM_SKU_IDX}),
+        ('apim_publisher_email', "Publisher Email", 'text', {}),
+        ('apim_publisher_name', "Publisher Name", 'text', {}),
+        ('api_id', "API ID", 'text', {}),
+        ('api_path', "API Path", 'text', {}),
+        ('api_display_name', "API Display Name", 'text', {}),
+        ('allowed_origins', "Allowed Origins (JSON array)", 'textarea', {}),
+    ),
+}
+
+def _render_settings_form(tab_name, env, saved_settings):
+    """
+    Render a tab's input fields from TAB_FORM_SPEC inside a form
+    
+    Args:
+        tab_name (str): The tab_settings key (e.g., 'networking')
+        env (str): Environment (dev, test, etc.) used for the default values
+        saved_settings (dict): The tab's currently saved settings
+        
+    Returns:
+        dict: The submitted field values keyed by setting name
+    """
+    defaults = compute_default_tab_settings(env)[tab_name]
+    values = {}
+    with st.form(f"{tab_name}_form"):
+        for setting, label, kind, options in TAB_FORM_SPEC[tab_name]:
+            if kind == 'subheader':
+                st.subheader(label)
+                continue
+            if kind == 'info':
+                st.info(label)
+                continue
+            
+            # Use saved settings if available
+            value = saved_settings.get(setting, defaults[setting])
+            if kind == 'text':
+                values[setting] = st.text_input(label, value=value, **options)
+            elif kind == 'number':
+                values[setting] = st.number_input(label, value=value, **options)
+            elif kind == 'textarea':
+                values[setting] = st.text_area(label, value=value, **options)
+            elif kind == 'select':
+                values[setting] = st.selectbox(label, options['options'],
+                                               index=options['index_map'].get(value, 0),
+                                               help=options.get('help'))
+        st.form_submit_button("Apply")
+    
+    return values
+
+def _reset_form_widgets(*tab_names):
+    """
+    Drop the state of keyed form fields so they show the saved settings again
+    
+    A keyed widget keeps its own value and ignores later value= arguments, so after
+    settings are replaced these fields would otherwise save their old values back.
+    
+    Args:
+        *tab_names (str): The tab_settings keys (e.g., 'networking') whose fields are reset
+    """
+    for tab_name in tab_names:
+        for _, _, _, options in TAB_FORM_SPEC[tab_name]:
+            if 'key' in options:
+                st.session_state.pop(options['key'], None)
+
+def _regen_jwt():
+    """Replace the JWT secret, and the input showing it, with a freshly generated one"""
+    new_secret = generate_jwt_secret()
+    update_jwt_secret(new_secret)
+    st.session_state['jwt_key_input'] = new_secret
+
+def _sync_jwt():
+    """Copy an edited JWT Secret Key input into the session's JWT secret"""
+    update_jwt_secret(st.session_state['jwt_key_input'])
+
+def _apply_import(tab_name, key_prefix, label, uploaded_file):
+    """
+    Parse an uploaded tab settings file, save it and rerun with the new values
+    
+    Args:
+        tab_name (str): The tab_settings key (e.g., 'basic_resources')
+        key_prefix (str): Prefix of the tab's show_*_uploader flag (e.g., 'basic')
+        label (str): Human readable tab name used in the status messages
+        uploaded_file: File object from st.file_uploader
+    """
+    settings = parse_uploaded_settings(uploaded_file)
+    if settings:
+        # Apply the imported settings to session state
+        save_tab_settings(tab_name, settings)
+        _reset_form_widgets(tab_name)
+        st.success(f"{label} settings imported!")
+        # Hide the uploader again so the file is not re-applied on every rerun
+        st.session_state[f'show_{key_prefix}_uploader'] = False
+        st.rerun()
+    else:
+        st.error("Failed to parse the uploaded file.")
+
+def _render_export_import(tab_name, key_prefix, label, saved_settings):
+    """
+    Render the Export/Import Tab Settings controls shared by the tabs
+    
+    Args:
+        tab_name (str): The tab_settings key (e.g., 'basic_resources')
+        key_prefix (str): Prefix for the widget keys and the show_*_uploader flag (e.g., 'basic')
+        label (str): Human readable tab name used in the status messages
+        saved_settings (dict): The tab's currently saved settings
+    """
+    # One bordered container per tab: the two buttons side by side, the uploader below them
+    with st.container(border=True):
+        col1, col2 = st.columns(2)
+        if col1.button("Export Tab Settings", key=f"export_{key_prefix}"):
+            if not saved_settings:
                 st.warning("No settings saved for this tab yet.")
             else:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                download_link = get_settings_download_link(
-                    tab_settings, 
-                    f"anpi_basic_resources_{timestamp}.json"
+                timestamp = time.strftime("%Y%m%d_%H%M%S")
+                st.download_button(
+                    label="Download Settings",
+                    data=get_settings_json(saved_settings),
+                    file_name=f"anpi_{tab_name}_{timestamp}.json",
+                    mime="application/json",
+                    key=f"download_{key_prefix}_settings"
                 )
-                st.markdown(download_link, unsafe_allow_html=True)
-                st.success("Basic resources settings exported!")
-    
-    with col2:
-        if st.button("Import Tab Settings", key="import_basic_button"):
-            st.session_state['show_basic_uploader'] = True
-    
-    with col3:
-        if st.session_state.get('show_basic_uploader', False):
-            uploaded_file = st.file_uploader("Choose a settings file", key="basic_uploader", type=["json"])
-            if uploaded_file is not None:
-                settings = parse_uploaded_settings(uploaded_file)
-                if settings:
-                    # Apply the imported settings to session state
-                    from state import save_tab_settings
-                    save_tab_settings('basic_resources', settings)
-                    st.success("Basic resources settings imported!")
-                    st.rerun()
-                else:
-                    st.error("Failed to parse the uploaded file.")
+                st.success(f"{label} settings exported!")
+        
+        if col2.button("Import Tab Settings", key=f"import_{key_prefix}_button"):
+            st.session_state[f'show_{key_prefix}_uploader'] = True
+        
+        if st.session_state.get(f'show_{key_prefix}_uploader', False):
+            # Picking a file only reruns once the form is submitted
+            with st.form(f"{key_prefix}_import_form"):
+                uploaded_file = st.file_uploader("Choose a settings file", key=f"{key_prefix}_uploader", type=["json"])
+                submitted = st.form_submit_button("Import")
+            if submitted and uploaded_file is not None:
+                _apply_import(tab_name, key_prefix, label, uploaded_file)
+
+@st.fragment
+def create_basic_resources_tab():
+    """Create the Basic Resources tab with export/import functionality"""
+    st.header("Resource Group and Basic Settings")
+    env = st.session_state.sidebar_values['env']
     
     # Load any saved settings
-    from state import load_tab_settings
     saved_settings = load_tab_settings('basic_resources')
     
-    # Set default values, using saved settings if available
-    default_rg_name = saved_settings.get('rg_name', f"itz-{env}-jpe-001")
-    default_anpi_tag = saved_settings.get('anpi_tag', f"Project=AnpiBot Environment={env.capitalize()}")
-    default_shared_tag = saved_settings.get('shared_tag', f"Environment={env.capitalize()} Project=ITZ-Chatbot")
-    default_api_base_url = saved_settings.get('api_base_url', "https://api-test.fjpservice.net")
-    default_timeout_minutes = saved_settings.get('timeout_minutes', 30)
-    default_jwt_issuer = saved_settings.get('jwt_issuer', "https://api.botframework.com")
-    default_jwt_expiry_minutes = saved_settings.get('jwt_expiry_minutes', 60)
+    # Add export/import functionality for this tab
+    _render_export_import('basic_resources', 'basic', "Basic resources", saved_settings)
     
     # Create input fields with default values
-    rg_name = st.text_input("Resource Group Name", value=default_rg_name)
-    anpi_tag = st.text_input("ANPI Tags", value=default_anpi_tag)
-    shared_tag = st.text_input("Shared Tags", value=default_shared_tag)
-    api_base_url = st.text_input("API Base URL", value=default_api_base_url)
-    timeout_minutes = st.number_input("Timeout Minutes", value=default_timeout_minutes, min_value=1, max_value=60)
-    jwt_issuer = st.text_input("JWT Issuer", value=default_jwt_issuer)
+    form_values = _render_settings_form('basic_resources', env, saved_settings)
     
     # JWT Secret Key with generate button
     col1, col2 = st.columns([3, 1])
     with col1:
-        # Link the text input to session state variable
+        # The input keeps its own state, seeded from the session's JWT secret; a keyed widget
+        # ignores later value= changes. Edits are written back by _sync_jwt.
+        if 'jwt_key_input' not in st.session_state:
+            st.session_state['jwt_key_input'] = st.session_state['jwt_secret_key']
         jwt_secret_key = st.text_input("JWT Secret Key", 
-                                      value=st.session_state['jwt_secret_key'], 
                                       type="password",
-                                      key="jwt_key_input")
-        # Update the session state when input changes
-        st.session_state['jwt_secret_key'] = jwt_secret_key
+                                      key="jwt_key_input",
+                                      on_change=_sync_jwt)
         
     with col2:
-        if st.button("Generate JWT Key"):
-            # Update the session state
-            new_key = generate_jwt_secret()
-            update_jwt_secret(new_key)
-            # Force rerun
-            st.rerun()
-    
-    jwt_expiry_minutes = st.number_input("JWT Expiry Minutes", value=default_jwt_expiry_minutes, min_value=1, max_value=1440)
+        # The callback runs before the rerun and sets the input too, so it shows the new key
+        st.button("Generate JWT Key", on_click=_regen_jwt)
     
     # Create a dictionary with the current settings
-    current_settings = {
-        'rg_name': rg_name,
-        'anpi_tag': anpi_tag,
-        'shared_tag': shared_tag,
-        'api_base_url': api_base_url,
-        'timeout_minutes': timeout_minutes,
-        'jwt_issuer': jwt_issuer,
-        'jwt_secret_key': jwt_secret_key,
-        'jwt_expiry_minutes': jwt_expiry_minutes
-    }
+    current_settings = {**form_values, 'jwt_secret_key': jwt_secret_key}
     
-    # Save the current settings to session state
-    from state import save_tab_settings
+    # Save the current settings to session state (a no-op when nothing changed)
     save_tab_settings('basic_resources', current_settings)
-    
-    return current_settings
 
+@st.fragment
 def create_networking_tab():
     """Create the Networking tab with export/import functionality"""
     env = st.session_state.sidebar_values['env']
     
     st.header("Networking Configuration")
     
-    # Add export/import functionality for this tab
-    col1, col2, col3 = st.columns([1, 1, 2])
-    with col1:
-        if st.button("Export Tab Settings", key="export_networking"):
-            # Get the current tab settings from session state or default values
-            from state import load_tab_settings
-            tab_settings = load_tab_settings('networking')
-            if not tab_settings:
-                st.warning("No settings saved for this tab yet.")
-            else:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                download_link = get_settings_download_link(
-                    tab_settings, 
-                    f"anpi_networking_{timestamp}.json"
-                )
-                st.markdown(download_link, unsafe_allow_html=True)
-                st.success("Networking settings exported!")
-    
-    with col2:
-        if st.button("Import Tab Settings", key="import_networking_button"):
-            st.session_state['show_networking_uploader'] = True
-    
-    with col3:
-        if st.session_state.get('show_networking_uploader', False):
-            uploaded_file = st.file_uploader("Choose a settings file", key="networking_uploader", type=["json"])
-            if uploaded_file is not None:
-                settings = parse_uploaded_settings(uploaded_file)
-                if settings:
-                    # Apply the imported settings to session state
-                    from state import save_tab_settings
-                    save_tab_settings('networking', settings)
-                    st.success("Networking settings imported!")
-                    st.rerun()
-                else:
-                    st.error("Failed to parse the uploaded file.")
-    
     # Load any saved settings
-    from state import load_tab_settings
     saved_settings = load_tab_settings('networking')
     
-    # Set default values, using saved settings if available
-    default_vnet_name = saved_settings.get('vnet_name', f"vnet-itz-{env}-jpe-001")
-    default_vnet_address_prefix = saved_settings.get('vnet_address_prefix', "10.0.0.0/16")
-    default_subnet_name = saved_settings.get('subnet_name', f"snet-itz-{env}-jpe-001")
-    default_subnet_prefix = saved_settings.get('subnet_prefix', "10.0.1.0/24")
-    default_pip_name = saved_settings.get('pip_name', f"pip-itz-anpi-{env}-jpe-001")
-    default_agw_name = saved_settings.get('agw_name', f"agw-itz-{env}-jpe-001")
-    default_waf_name = saved_settings.get('waf_name', f"waf-itz-{env}-jpe-001")
-    
-    # Create input fields with default values and unique keys
-    vnet_name = st.text_input("Virtual Network Name", value=default_vnet_name, key="net_vnet_name")
-    vnet_address_prefix = st.text_input("VNet Address Prefix", value=default_vnet_address_prefix, key="net_vnet_prefix")
-    
-    st.subheader("Subnets")
-    subnet_name = st.text_input("Subnet Name", value=default_subnet_name, key="net_subnet_name")
-    subnet_prefix = st.text_input("Subnet Address Prefix", value=default_subnet_prefix, key="net_subnet_prefix")
-    
-    st.subheader("Application Gateway")
-    pip_name = st.text_input("Public IP Name", value=default_pip_name, key="net_pip_name")
-    agw_name = st.text_input("Application Gateway Name", value=default_agw_name, key="net_agw_name")
-    waf_name = st.text_input("WAF Policy Name", value=default_waf_name, key="net_waf_name")
+    # Add export/import functionality for this tab
+    _render_export_import('networking', 'networking', "Networking", saved_settings)
     
-    # Create a dictionary with the current settings
-    current_settings = {
-        'vnet_name': vnet_name,
-        'vnet_address_prefix': vnet_address_prefix,
-        'subnet_name': subnet_name,
-        'subnet_prefix': subnet_prefix,
-        'pip_name': pip_name,
-        'agw_name': agw_name,
-        'waf_name': waf_name
-    }
+    # Create input fields with default values
+    current_settings = _render_settings_form('networking', env, saved_settings)
     
-    # Save the current settings to session state
-    from state import save_tab_settings
+    # Save the current settings to session state (a no-op when nothing changed)
     save_tab_settings('networking', current_settings)
     
-    return current_settings
+    # Add ARM template generator in the networking tab; rendering it in this fragment
+    # keeps its inputs in step with the settings submitted above
+    create_arm_template_section(current_settings, env, st.session_state.sidebar_values['location'])
 
+@st.fragment
 def create_app_service_tab():
     """Create the App Service tab with export/import functionality"""
     env = st.session_state.sidebar_values['env']
     
     st.header("App Service Configuration")
     
-    # Add export/import functionality for this tab
-    col1, col2, col3 = st.columns([1, 1, 2])
-    with col1:
-        if st.button("Export Tab Settings", key="export_app_service"):
-            # Get the current tab settings from session state or default values
-            from state import load_tab_settings
-            tab_settings = load_tab_settings('app_service')
-            if not tab_settings:
-                st.warning("No settings saved for this tab yet.")
-            else:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                download_link = get_settings_download_link(
-                    tab_settings, 
-                    f"anpi_app_service_{timestamp}.json"
-                )
-                st.markdown(download_link, unsafe_allow_html=True)
-                st.success("App Service settings exported!")
-    
-    with col2:
-        if st.button("Import Tab Settings", key="import_app_service_button"):
-            st.session_state['show_app_service_uploader'] = True
-    
-    with col3:
-        if st.session_state.get('show_app_service_uploader', False):
-            uploaded_file = st.file_uploader("Choose a settings file", key="app_service_uploader", type=["json"])
-            if uploaded_file is not None:
-                settings = parse_uploaded_settings(uploaded_file)
-                if settings:
-                    # Apply the imported settings to session state
-                    from state import save_tab_settings
-                    save_tab_settings('app_service', settings)
-                    st.success("App Service settings imported!")
-                    st.rerun()
-                else:
-                    st.error("Failed to parse the uploaded file.")
-    
     # Load any saved settings
-    from state import load_tab_settings
     saved_settings = load_tab_settings('app_service')
     
-    # Set default values, using saved settings if available
-    default_asp_name = saved_settings.get('asp_name', f"asp-itz-{env}-001")
-    default_asp_sku = saved_settings.get('asp_sku', "B1")
-    default_app_name = saved_settings.get('app_name', f"app-itz-anpi-{env}-001")
-    default_app_runtime = saved_settings.get('app_runtime', "DOTNETCORE|6.0")
-    default_appinsights_name = saved_settings.get('appinsights_name', f"appi-itz-anpi-{env}-jpe-001")
-    default_bot_name = saved_settings.get('bot_name', f"bot-itz-anpi-{env}")
+    # Add export/import functionality for this tab
+    _render_export_import('app_service', 'app_service', "App Service", saved_settings)
     
     # Create input fields with default values
-    asp_name = st.text_input("App Service Plan Name", value=default_asp_name)
-    asp_sku = st.selectbox("App Service Plan SKU", ["B1", "S1", "P1V2", "P2V2", "P3V2"], 
-                           index=["B1", "S1", "P1V2", "P2V2", "P3V2"].index(default_asp_sku) if default_asp_sku in ["B1", "S1", "P1V2", "P2V2", "P3V2"] else 0)
-    
-    app_name = st.text_input("Web App Name", value=default_app_name)
-    runtime_options = ["DOTNETCORE|6.0", "DOTNETCORE|7.0", "DOTNETCORE|8.0", "NODE|14-lts", "NODE|16-lts"]
-    app_runtime = st.selectbox("App Runtime", runtime_options,
-                              index=runtime_options.index(default_app_runtime) if default_app_runtime in runtime_options else 0)
-    
-    st.subheader("Application Insights")
-    appinsights_name = st.text_input("Application Insights Name", value=default_appinsights_name)
-    
-    bot_name = st.text_input("Bot Service Name", value=default_bot_name)
+    current_settings = _render_settings_form('app_service', env, saved_settings)
     
-    # Create a dictionary with the current settings
-    current_settings = {
-        'asp_name': asp_name,
-        'asp_sku': asp_sku,
-        'app_name': app_name,
-        'app_runtime': app_runtime,
-        'appinsights_name': appinsights_name,
-        'bot_name': bot_name
-    }
-    
-    # Save the current settings to session state
-    from state import save_tab_settings
+    # Save the current settings to session state (a no-op when nothing changed)
     save_tab_settings('app_service', current_settings)
-    
-    return current_settings
 
+@st.fragment
 def create_data_ai_tab():
     """Create the Data and AI Services tab with export/import functionality"""
     env = st.session_state.sidebar_values['env']
     
     st.header("Data and AI Services")
     
-    # Add export/import functionality for this tab
-    col1, col2, col3 = st.columns([1, 1, 2])
-    with col1:
-        if st.button("Export Tab Settings", key="export_data_ai"):
-            # Get the current tab settings from session state or default values
-            from state import load_tab_settings
-            tab_settings = load_tab_settings('data_ai')
-            if not tab_settings:
-                st.warning("No settings saved for this tab yet.")
-            else:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                download_link = get_settings_download_link(
-                    tab_settings, 
-                    f"anpi_data_ai_{timestamp}.json"
-                )
-                st.markdown(download_link, unsafe_allow_html=True)
-                st.success("Data & AI settings exported!")
-    
-    with col2:
-        if st.button("Import Tab Settings", key="import_data_ai_button"):
-            st.session_state['show_data_ai_uploader'] = True
-    
-    with col3:
-        if st.session_state.get('show_data_ai_uploader', False):
-            uploaded_file = st.file_uploader("Choose a settings file", key="data_ai_uploader", type=["json"])
-            if uploaded_file is not None:
-                settings = parse_uploaded_settings(uploaded_file)
-                if settings:
-                    # Apply the imported settings to session state
-                    from state import save_tab_settings
-                    save_tab_settings('data_ai', settings)
-                    st.success("Data & AI settings imported!")
-                    st.rerun()
-                else:
-                    st.error("Failed to parse the uploaded file.")
-    
     # Load any saved settings
-    from state import load_tab_settings
     saved_settings = load_tab_settings('data_ai')
     
-    # Set default values, using saved settings if available
-    default_kv_name = saved_settings.get('kv_name', f"kv-itz-{env}-jpe-001")
-    default_cosmos_name = saved_settings.get('cosmos_name', f"cosmos-itz-{env}")
-    default_cosmos_db_name = saved_settings.get('cosmos_db_name', "AnpiDb")
-    default_openai_name = saved_settings.get('openai_name', f"oai-itz-{env}")
-    default_openai_model = saved_settings.get('openai_model', "gpt-4o-mini")
-    default_openai_region = saved_settings.get('openai_region', "eastus")
-    default_model_version = saved_settings.get('model_version', "2024-07-18")
-    default_embedding_model = saved_settings.get('embedding_model', "text-embedding-ada-002")
-    default_embedding_model_version = saved_settings.get('embedding_model_version', 2)
-    default_search_name = saved_settings.get('search_name', f"srch-itz-{env}")
-    default_search_sku = saved_settings.get('search_sku', "Basic")
-    default_search_index_name = saved_settings.get('search_index_name', "anpi-knowledge")
-    default_semantic_config_name = saved_settings.get('semantic_config_name', "my-semantic-config")
+    # Add export/import functionality for this tab
+    _render_export_import('data_ai', 'data_ai', "Data & AI", saved_settings)
     
     # Create input fields with default values
-    st.subheader("Key Vault")
-    kv_name = st.text_input("Key Vault Name", value=default_kv_name)
-    
-    st.subheader("Cosmos DB")
-    cosmos_name = st.text_input("Cosmos DB Account Name", value=default_cosmos_name)
-    cosmos_db_name = st.text_input("Cosmos DB Database Name", value=default_cosmos_db_name)
-    
-    st.subheader("Azure OpenAI")
-    openai_name = st.text_input("OpenAI Service Name", value=default_openai_name)
-    
-    # Add region selection specifically for OpenAI
-    openai_regions = ["japaneast", "eastus", "southeastasia"]
-    openai_region = st.selectbox(
-        "OpenAI Region", 
-        openai_regions,
-        index=openai_regions.index(default_openai_region) if default_openai_region in openai_regions else 0,
-        help="Azure OpenAI is only available in select regions. Choose one that supports the models you need."
-    )
-    
-    openai_models = ["gpt-4o-mini", "gpt-4o", "gpt-35-turbo", "gpt-4"]
-    openai_model = st.selectbox(
-        "OpenAI Model", 
-        openai_models,
-        index=openai_models.index(default_openai_model) if default_openai_model in openai_models else 0
-    )
-    
-    # Add a note about model availability in regions
-    st.info("Note: Not all models are available in all regions. GPT-4o models might only be available in East US.")
-    
-    model_version = st.text_input("Model Version", value=default_model_version)
-    embedding_model = st.text_input("Embedding Model", value=default_embedding_model)
-    embedding_model_version = st.number_input("Embedding Model Version", value=default_embedding_model_version, min_value=1)
-    
-    st.subheader("Azure Search")
-    search_name = st.text_input("Search Service Name", value=default_search_name)
-    search_skus = ["Basic", "Standard", "Standard2", "Standard3"]
-    search_sku = st.selectbox("Search SKU", search_skus,
-                             index=search_skus.index(default_search_sku) if default_search_sku in search_skus else 0)
-    search_index_name = st.text_input("Search Index Name", value=default_search_index_name)
-    semantic_config_name = st.text_input("Semantic Config Name", value=default_semantic_config_name)
+    current_settings = _render_settings_form('data_ai', env, saved_settings)
+    cosmos_name = current_settings['cosmos_name']
+    cosmos_db_name = current_settings['cosmos_db_name']
+    search_index_name = current_settings['search_index_name']
+    semantic_config_name = current_settings['semantic_config_name']
     
     # Add download buttons for search index and indexer JSON
     st.markdown("### Search Index Configuration")
@@ -541,7 +648,7 @@ def create_data_ai_tab():
     with col1:
         if st.button("Download Index JSON"):
             index_json = get_search_index_json(search_index_name, semantic_config_name)
-            index_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            index_timestamp = time.strftime("%Y%m%d_%H%M%S")
             download_link = get_json_download_link(
                 index_json,
                 f"anpi_search_index_{env}_{index_timestamp}.json"
@@ -551,7 +658,7 @@ def create_data_ai_tab():
     with col2:
         if st.button("Download Indexer JSON"):
             indexer_json = get_search_indexer_json(search_index_name)
-            indexer_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            indexer_timestamp = time.strftime("%Y%m%d_%H%M%S")
             download_link = get_json_download_link(
                 indexer_json,
                 f"anpi_search_indexer_{env}_{indexer_timestamp}.json"
@@ -562,7 +669,7 @@ def create_data_ai_tab():
     with col1:
         if st.button("Download Data Source JSON"):
             datasource_json = get_search_datasource_json(cosmos_name, cosmos_db_name, search_index_name)
-            datasource_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            datasource_timestamp = time.strftime("%Y%m%d_%H%M%S")
             download_link = get_json_download_link(
                 datasource_json,
                 f"anpi_search_datasource_{env}_{datasource_timestamp}.json"
@@ -572,7 +679,7 @@ def create_data_ai_tab():
     with col2:
         if st.button("Download Knowledge Init JSON"):
             knowledge_json = get_initial_knowledge_json()
-            knowledge_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            knowledge_timestamp = time.strftime("%Y%m%d_%H%M%S")
             download_link = get_json_download_link(
                 knowledge_json,
                 f"anpi_initial_knowledge_{env}_{knowledge_timestamp}.json"
@@ -674,100 +781,41 @@ def create_data_ai_tab():
         ```
         """)
     
-    # Create a dictionary with the current settings
-    current_settings = {
-        'kv_name': kv_name,
-        'cosmos_name': cosmos_name,
-        'cosmos_db_name': cosmos_db_name,
-        'openai_name': openai_name,
-        'openai_region': openai_region,
-        'openai_model': openai_model,
-        'model_version': model_version,
-        'embedding_model': embedding_model,
-        'embedding_model_version': embedding_model_version,
-        'search_name': search_name,
-        'search_sku': search_sku,
-        'search_index_name': search_index_name,
-        'semantic_config_name': semantic_config_name
-    }
-    
-    # Save the current settings to session state
-    from state import save_tab_settings
+    # Save the current settings to session state (a no-op when nothing changed)
     save_tab_settings('data_ai', current_settings)
-    
-    return current_settings
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def _parse_origins(text):
+    """Parse an Allowed Origins JSON string; keyed on the raw text only"""
+    return json.loads(text)
+
+@st.fragment
 def create_api_management_tab():
     """Create the API Management tab with fields from ARM template and export/import functionality"""
-    st.header("API Management")
-    
-    # Add export/import functionality for this tab
-    col1, col2, col3 = st.columns([1, 1, 2])
-    with col1:
-        if st.button("Export Tab Settings", key="export_api_mgmt"):
-            # Get the current tab settings from session state or default values
-            from state import load_tab_settings
-            tab_settings = load_tab_settings('api_management')
-            if not tab_settings:
-                st.warning("No settings saved for this tab yet.")
-            else:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                download_link = get_settings_download_link(
-                    tab_settings, 
-                    f"anpi_api_management_{timestamp}.json"
-                )
-                st.markdown(download_link, unsafe_allow_html=True)
-                st.success("API Management settings exported!")
-    
-    with col2:
-        if st.button("Import Tab Settings", key="import_api_mgmt_button"):
-            st.session_state['show_api_mgmt_uploader'] = True
+    env = st.session_state.sidebar_values['env']
     
-    with col3:
-        if st.session_state.get('show_api_mgmt_uploader', False):
-            uploaded_file = st.file_uploader("Choose a settings file", key="api_mgmt_uploader", type=["json"])
-            if uploaded_file is not None:
-                settings = parse_uploaded_settings(uploaded_file)
-                if settings:
-                    # Apply the imported settings to session state
-                    from state import save_tab_settings
-                    save_tab_settings('api_management', settings)
-                    st.success("API Management settings imported!")
-                    st.rerun()
-                else:
-                    st.error("Failed to parse the uploaded file.")
+    st.header("API Management")
     
     # Load any saved settings
-    from state import load_tab_settings
     saved_settings = load_tab_settings('api_management')
     
-    # Set default values, using saved settings if available
-    default_apim_name = saved_settings.get('apim_name', "apim-itz-fjp")
-    default_apim_sku = saved_settings.get('apim_sku', "Consumption")
-    default_apim_publisher_email = saved_settings.get('apim_publisher_email', "tuyendhq@fpt.com")
-    default_apim_publisher_name = saved_settings.get('apim_publisher_name', "FJP Japan Holding")
-    default_api_id = saved_settings.get('api_id', "anpi-bot-api")
-    default_api_path = saved_settings.get('api_path', "anpi")
-    default_api_display_name = saved_settings.get('api_display_name', "ANPI Bot API")
-    default_allowed_origins = saved_settings.get('allowed_origins', '["https://*.fjpservice.net","https://localhost:4200"]')
+    # Add export/import functionality for this tab
+    _render_export_import('api_management', 'api_mgmt', "API Management", saved_settings)
     
     # Create input fields with default values
-    apim_name = st.text_input("API Management Name", value=default_apim_name)
-    
-    # Updated SKU options to include Consumption per ARM template
-    sku_options = ["Consumption", "Developer", "Basic", "Standard", "Premium"]
-    apim_sku = st.selectbox("API Management SKU", sku_options,
-                           index=sku_options.index(default_apim_sku) if default_apim_sku in sku_options else 0)
-    
-    # Updated with publisher details from the ARM template
-    apim_publisher_email = st.text_input("Publisher Email", value=default_apim_publisher_email)
-    apim_publisher_name = st.text_input("Publisher Name", value=default_apim_publisher_name)
-    
-    api_id = st.text_input("API ID", value=default_api_id)
-    api_path = st.text_input("API Path", value=default_api_path)
-    api_display_name = st.text_input("API Display Name", value=default_api_display_name)
-    
-    allowed_origins = st.text_area("Allowed Origins (JSON array)", value=default_allowed_origins)
+    current_settings = _render_settings_form('api_management', env, saved_settings)
+    apim_name = current_settings['apim_name']
+    api_id = current_settings['api_id']
+    api_path = current_settings['api_path']
+    api_display_name = current_settings['api_display_name']
+    # Parse the text currently shown, which also covers values brought in by an import;
+    # repeat runs with the same text are served from the _parse_origins cache
+    try:
+        allowed_origins = _parse_origins(current_settings['allowed_origins'])
+    except json.JSONDecodeError as e:
+        # Same fallback the policy generator uses for invalid JSON
+        allowed_origins = list(_DEFAULT_ALLOWED_ORIGINS)
+        st.error(f"Invalid JSON in Allowed Origins: {e}. The default origins will be used.")
     
     # Save to session state for yaml generation
     st.session_state['apim_name'] = apim_name
@@ -775,20 +823,7 @@ def create_api_management_tab():
     st.session_state['api_id'] = api_id
     st.session_state['api_display_name'] = api_display_name
     
-    # Create a dictionary with the current settings
-    current_settings = {
-        'apim_name': apim_name,
-        'apim_sku': apim_sku,
-        'apim_publisher_email': apim_publisher_email,
-        'apim_publisher_name': apim_publisher_name,
-        'api_id': api_id,
-        'api_path': api_path,
-        'api_display_name': api_display_name,
-        'allowed_origins': allowed_origins
-    }
-    
-    # Save the current settings to session state
-    from state import save_tab_settings
+    # Save the current settings to session state (a no-op when nothing changed)
     save_tab_settings('api_management', current_settings)
     
     # API Management configuration downloads section
@@ -801,16 +836,13 @@ def create_api_management_tab():
         st.info("Download the API policy XML file for configuring your API in the Azure Portal.")
         if st.button("Download APIM Policy XML"):
             policy_xml = get_apim_policy_xml(allowed_origins)
-            policy_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            policy_timestamp = time.strftime("%Y%m%d_%H%M%S")
             download_link = get_xml_download_link(
                 policy_xml,
                 f"apim_policy_{policy_timestamp}.xml"
             )
             st.markdown(download_link, unsafe_allow_html=True)
     
-    # Get current environment from sidebar values
-    env = st.session_state.sidebar_values.get('env', 'dev')
-    
     # Get API base URL (for direct access)
     api_base_url = saved_settings.get('api_base_url', "https://api-test.fjpservice.net")
     if 'basic_resources' in st.session_state.tab_settings:
@@ -843,14 +875,14 @@ def create_api_management_tab():
     st.markdown("### API Configuration YAML")
     st.markdown("Download a sample YAML file for API configuration. You can import this file in the Azure Portal.")
     
-    # Get app name for YAML generation
-    app_name = f"app-itz-anpi-{env}-001"
-    if 'app_service' in st.session_state.tab_settings:
-        app_name = st.session_state.tab_settings['app_service'].get('app_name', app_name)
-    
-    # Create download link
-    yaml_download_link = get_yaml_download_link(api_display_name, env, app_name, apim_name, api_path)
-    st.markdown(yaml_download_link, unsafe_allow_html=True)
+    # Serve the YAML bytes directly; a download button needs no base64 data URL
+    st.download_button(
+        label="Download OpenAPI YAML",
+        data=get_openapi_yaml(api_display_name, env, apim_name, api_path),
+        file_name=f"anpi_bot_api_{env}.openapi.yaml",
+        mime="application/yaml",
+        key="download_openapi_yaml_apim"
+    )
     
     # Add guidance about all API documentation formats
     with st.expander("Understanding API Documentation Formats", expanded=True):
@@ -974,49 +1006,54 @@ def create_api_management_tab():
     # Add the API import section to allow uploading and viewing Postman/Swagger files
     create_api_import_section(st)
     
-    return current_settings
-    
+@st.fragment
 def create_cicd_tab():
     """Create the CI/CD Configuration tab for Azure DevOps pipelines"""
+    env = st.session_state.sidebar_values['env']
+    
     st.header("Azure DevOps CI/CD Pipeline Configuration")
     
     # Load any saved settings
-    from state import load_tab_settings
     saved_settings = load_tab_settings('cicd')
+    defaults = compute_default_tab_settings(env)['cicd']
     
     # Set default values, using saved settings if available
-    default_project_url = saved_settings.get('project_url', "https://dev.azure.com/FJPFST/ANPI%20Teams%20Bot")
-    default_repo_url = saved_settings.get('repo_url', "https://FJPFST@dev.azure.com/FJPFST/ANPI%20Teams%20Bot/_git/ANPI%20Teams%20Bot")
-    default_service_conn_name = saved_settings.get('service_conn_name', "ANPI-Azure-Connection")
+    default_project_url = saved_settings.get('project_url', defaults['project_url'])
+    default_repo_url = saved_settings.get('repo_url', defaults['repo_url'])
+    default_service_conn_name = saved_settings.get('service_conn_name', defaults['service_conn_name'])
     
     # Project settings
-    st.subheader("Azure DevOps Project Settings")
-    project_url = st.text_input("Project URL", value=default_project_url)
-    repo_url = st.text_input("Repository URL", value=default_repo_url)
+    with st.form("cicd_form"):
+        st.subheader("Azure DevOps Project Settings")
+        project_url = st.text_input("Project URL", value=default_project_url)
+        repo_url = st.text_input("Repository URL", value=default_repo_url)
     
-    # Service connection settings
-    st.subheader("Service Connections")
-    st.info("Configure service connections for deploying to different environments")
+        # Service connection settings
+        st.subheader("Service Connections")
+        st.info("Configure service connections for deploying to different environments")
     
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        service_conn_name = st.text_input("Base Service Connection Name", value=default_service_conn_name)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            service_conn_name = st.text_input("Base Service Connection Name", value=default_service_conn_name)
         
-    # Branch environments
-    st.subheader("Branch Environments")
-    env_dev = st.checkbox("Development Environment", value=True)
-    env_test = st.checkbox("Test Environment", value=True)
-    env_prod = st.checkbox("Production Environment", value=True)
+        # Branch environments
+        st.subheader("Branch Environments")
+        env_dev = st.checkbox("Development Environment", value=True)
+        env_test = st.checkbox("Test Environment", value=True)
+        env_prod = st.checkbox("Production Environment", value=True)
+        st.form_submit_button("Apply")
     
     # Generate button
     if st.button("Generate Azure Pipelines YAML"):
         pipeline_yaml = generate_azure_pipeline_yaml(service_conn_name)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        download_link = get_yaml_download_link(
-            pipeline_yaml,
-            f"azure-pipelines_{timestamp}.yml"
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        st.download_button(
+            label="Download azure-pipelines.yml",
+            data=pipeline_yaml,
+            file_name=f"azure-pipelines_{timestamp}.yml",
+            mime="application/yaml",
+            key="download_pipeline_yaml"
         )
-        st.markdown(download_link, unsafe_allow_html=True)
         
         # Show instructions
         st.success("Azure Pipelines YAML file generated successfully!")
@@ -1083,61 +1120,72 @@ def create_cicd_tab():
         'env_prod': env_prod
     }
     
-    # Save the current settings to session state
-    from state import save_tab_settings
+    # Save the current settings to session state (a no-op when nothing changed)
     save_tab_settings('cicd', current_settings)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_teams_package_link(teams_app_name, bot_id, package_name, env):
+    """Build the Teams app package ZIP link once per distinct set of inputs
     
-    return current_settings
+    Args:
+        teams_app_name (str): Name of the Teams app
+        bot_id (str): Bot ID (same as MS App ID)
+        package_name (str): Package name for the app
+        env (str): Environment (dev, test, etc.)
+    """
+    return get_teams_app_manifest_download_link(teams_app_name, bot_id, package_name, env)
 
+@st.fragment
 def create_teams_integration_tab():
     """Create the Teams Integration tab with export/import functionality and channel setup guidance"""
     env = st.session_state.sidebar_values['env']
     
     st.header("Teams Integration")
     
-    # Add export/import functionality for this tab
-    # (Existing export/import code)
-    
     # Load any saved settings
-    from state import load_tab_settings
     saved_settings = load_tab_settings('teams_integration')
     
+    # Add export/import functionality for this tab
+    _render_export_import('teams_integration', 'teams', "Teams Integration", saved_settings)
+    defaults = compute_default_tab_settings(env)['teams_integration']
+    
     # Set default values, using saved settings if available
-    default_teams_app_name = saved_settings.get('teams_app_name', f"ANPI Teams Bot {env.capitalize()}")
-    default_teams_redirect_uri = saved_settings.get('teams_redirect_uri', "https://token.botframework.com/.auth/web/redirect")
-    default_bot_id = saved_settings.get('bot_id', "add0fcf1-3190-4a12-8ca0-00c47acb6178")
-    default_package_name = saved_settings.get('package_name', f"com.fjp.anpibot{env}")
+    default_teams_app_name = saved_settings.get('teams_app_name', defaults['teams_app_name'])
+    default_teams_redirect_uri = saved_settings.get('teams_redirect_uri', defaults['teams_redirect_uri'])
+    default_bot_id = saved_settings.get('bot_id', defaults['bot_id'])
+    default_package_name = saved_settings.get('package_name', defaults['package_name'])
     
     # Create input fields with default values
-    teams_app_name = st.text_input("Teams App Name", value=default_teams_app_name)
-    teams_redirect_uri = st.text_input("Teams Redirect URI", value=default_teams_redirect_uri)
+    with st.form("teams_integration_form"):
+        teams_app_name = st.text_input("Teams App Name", value=default_teams_app_name)
+        teams_redirect_uri = st.text_input("Teams Redirect URI", value=default_teams_redirect_uri)
     
-    # Add Bot ID field (same as MS App ID)
-    col1, col2 = st.columns(2)
-    with col1:
-        bot_id = st.text_input("Bot ID (same as MS App ID)", 
-                               value=st.session_state.sidebar_values.get('ms_app_id', default_bot_id))
+        # Add Bot ID field (same as MS App ID)
+        col1, col2 = st.columns(2)
+        with col1:
+            bot_id = st.text_input("Bot ID (same as MS App ID)", 
+                                   value=st.session_state.sidebar_values.get('ms_app_id', default_bot_id))
     
-    with col2:
-        package_name = st.text_input("Package Name", value=default_package_name)
+        with col2:
+            package_name = st.text_input("Package Name", value=default_package_name)
+        st.form_submit_button("Apply")
     
     # Download Teams App Manifest
     st.subheader("Teams App Package")
     st.info("Download a Teams app manifest package (ZIP) to use when registering your bot in Teams.")
     
     # Button to download the Teams app manifest ZIP
+    package_inputs = (teams_app_name, bot_id, package_name, env)
     if st.button("Generate Teams App Package"):
-        # Generate the manifest and ZIP file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        download_link = get_teams_app_manifest_download_link(
-            teams_app_name, 
-            bot_id, 
-            package_name,
-            env
-        )
-        st.markdown(download_link, unsafe_allow_html=True)
+        # Generate the manifest and ZIP file, keeping the link for later reruns
+        st.session_state['teams_package_link'] = (package_inputs, _cached_teams_package_link(*package_inputs))
         st.success("Teams app manifest package generated successfully!")
     
+    # Keep showing the last package link while the inputs it was built from are unchanged
+    link_inputs, download_link = st.session_state.get('teams_package_link', (None, None))
+    if link_inputs == package_inputs:
+        st.markdown(download_link, unsafe_allow_html=True)
+    
     # Teams Channel Configuration Section
     st.subheader("Microsoft Teams Channel Setup")
     st.info("Follow these steps to enable and configure the Microsoft Teams channel for your bot.")
@@ -1231,88 +1279,106 @@ def create_teams_integration_tab():
         'package_name': package_name
     }
     
-    # Save the current settings to session state
-    from state import save_tab_settings
+    # Save the current settings to session state (a no-op when nothing changed)
     save_tab_settings('teams_integration', current_settings)
-    
-    return current_settings
-def create_deployment_checklist_tab():
-    """Create the Deployment Checklist tab with comprehensive security checks"""
-    st.header("Deployment Checklist")
-    
-    # Create expandable sections for different check categories
-    with st.expander("1. Initial Setup", expanded=True):
-        if "setup_checks" not in st.session_state.checklist_state:
-            st.session_state.checklist_state["setup_checks"] = [False, False, False]
-        
-        setup_checks = st.session_state.checklist_state["setup_checks"]
-        setup_checks[0] = st.checkbox("☐ Install Azure CLI", value=setup_checks[0], key="check_install_cli")
-        setup_checks[1] = st.checkbox("☐ Login to Azure CLI (`az login`)", value=setup_checks[1], key="check_login_cli")
-        setup_checks[2] = st.checkbox("☐ Set correct subscription (`az account set --subscription \"$SUBSCRIPTION_ID\"`)", value=setup_checks[2], key="check_set_sub")
-    
-    with st.expander("2. Resource Group Deployment", expanded=True):
-        if "rg_checks" not in st.session_state.checklist_state:
-            st.session_state.checklist_state["rg_checks"] = [False]
-        
-        rg_checks = st.session_state.checklist_state["rg_checks"]
-        rg_checks[0] = st.checkbox("☐ Create Resource Group", value=rg_checks[0], key="check_create_rg")
-    
-    with st.expander("3. API Management & Networking", expanded=True):
-        if "api_net_checks" not in st.session_state.checklist_state:
-            st.session_state.checklist_state["api_net_checks"] = [False, False, False, False, False]
-        
-        api_net_checks = st.session_state.checklist_state["api_net_checks"]
-        api_net_checks[0] = st.checkbox("☐ Create API Management Service", value=api_net_checks[0], key="check_create_apim")
-        api_net_checks[1] = st.checkbox("☐ Create Virtual Network and Subnet", value=api_net_checks[1], key="check_create_vnet")
-        api_net_checks[2] = st.checkbox("☐ Create Public IP Address", value=api_net_checks[2], key="check_create_pip")
-        api_net_checks[3] = st.checkbox("☐ Create Application Gateway with WAF", value=api_net_checks[3], key="check_create_agw")
-        api_net_checks[4] = st.checkbox("☐ Configure API in APIM", value=api_net_checks[4], key="check_config_apim")
-    
-    with st.expander("4. Data & AI Services", expanded=True):
-        if "data_checks" not in st.session_state.checklist_state:
-            st.session_state.checklist_state["data_checks"] = [False, False, False, False, False]
-        
-        data_checks = st.session_state.checklist_state["data_checks"]
-        data_checks[0] = st.checkbox("☐ Create Key Vault", value=data_checks[0], key="check_create_kv")
-        data_checks[1] = st.checkbox("☐ Create Cosmos DB and Containers", value=data_checks[1], key="check_create_cosmos")
-        data_checks[2] = st.checkbox("☐ Create Azure OpenAI Service", value=data_checks[2], key="check_create_openai")
-        data_checks[3] = st.checkbox("☐ Deploy OpenAI Models", value=data_checks[3], key="check_deploy_models")
-        data_checks[4] = st.checkbox("☐ Create Azure Search Service and Index", value=data_checks[4], key="check_create_search")
-    
-    with st.expander("5. App Service & Bot Configuration", expanded=True):
-        if "app_checks" not in st.session_state.checklist_state:
-            st.session_state.checklist_state["app_checks"] = [False, False, False, False, False]
-        
-        app_checks = st.session_state.checklist_state["app_checks"]
-        app_checks[0] = st.checkbox("☐ Create App Service Plan", value=app_checks[0], key="check_create_asp")
-        app_checks[1] = st.checkbox("☐ Create Application Insights", value=app_checks[1], key="check_create_appins")
-        app_checks[2] = st.checkbox("☐ Create Web App", value=app_checks[2], key="check_create_webapp")
-        app_checks[3] = st.checkbox("☐ Store Secrets in Key Vault", value=app_checks[3], key="check_store_secrets")
-        app_checks[4] = st.checkbox("☐ Create Bot Service", value=app_checks[4], key="check_create_bot")
-    
-    with st.expander("6. Teams Integration", expanded=True):
-        if "teams_checks" not in st.session_state.checklist_state:
-            st.session_state.checklist_state["teams_checks"] = [False, False, False]
-        
-        teams_checks = st.session_state.checklist_state["teams_checks"]
-        teams_checks[0] = st.checkbox("☐ Register Teams App", value=teams_checks[0], key="check_register_teams")
-        teams_checks[1] = st.checkbox("☐ Configure Teams Channel in Bot", value=teams_checks[1], key="check_teams_channel")
-        teams_checks[2] = st.checkbox("☐ Test Teams Integration", value=teams_checks[2], key="check_verify_teams")
-    
-    with st.expander("7. Network Security & Isolation", expanded=True):
-        if "net_sec_checks" not in st.session_state.checklist_state:
-            st.session_state.checklist_state["net_sec_checks"] = [False, False, False, False, False]
-        
-        net_sec_checks = st.session_state.checklist_state["net_sec_checks"]
-        
-        # Check 1: Verify services in VNet
-        col1, col2 = st.columns([1, 3])
-        with col1:
-            net_sec_checks[0] = st.checkbox("☐ Verify all services are inside Virtual Network or have Private Endpoints", 
-                                            value=net_sec_checks[0], key="check_vnet_integration")
-        with col2:
-            if st.button("Show Verification Script", key="script_vnet_check"):
-                st.code("""
+
+# Deployment checklist layout: (section title, persistence group, ((check id / widget key, label), ...))
+CHECKLIST_SPEC = (
+    ("1. Initial Setup", "setup_checks", (
+        ("check_install_cli", "☐ Install Azure CLI"),
+        ("check_login_cli", "☐ Login to Azure CLI (`az login`)"),
+        ("check_set_sub", "☐ Set correct subscription (`az account set --subscription \"$SUBSCRIPTION_ID\"`)"),
+    )),
+    ("2. Resource Group Deployment", "rg_checks", (
+        ("check_create_rg", "☐ Create Resource Group"),
+    )),
+    ("3. API Management & Networking", "api_net_checks", (
+        ("check_create_apim", "☐ Create API Management Service"),
+        ("check_create_vnet", "☐ Create Virtual Network and Subnet"),
+        ("check_create_pip", "☐ Create Public IP Address"),
+        ("check_create_agw", "☐ Create Application Gateway with WAF"),
+        ("check_config_apim", "☐ Configure API in APIM"),
+    )),
+    ("4. Data & AI Services", "data_checks", (
+        ("check_create_kv", "☐ Create Key Vault"),
+        ("check_create_cosmos", "☐ Create Cosmos DB and Containers"),
+        ("check_create_openai", "☐ Create Azure OpenAI Service"),
+        ("check_deploy_models", "☐ Deploy OpenAI Models"),
+        ("check_create_search", "☐ Create Azure Search Service and Index"),
+    )),
+    ("5. App Service & Bot Configuration", "app_checks", (
+        ("check_create_asp", "☐ Create App Service Plan"),
+        ("check_create_appins", "☐ Create Application Insights"),
+        ("check_create_webapp", "☐ Create Web App"),
+        ("check_store_secrets", "☐ Store Secrets in Key Vault"),
+        ("check_create_bot", "☐ Create Bot Service"),
+    )),
+    ("6. Teams Integration", "teams_checks", (
+        ("check_register_teams", "☐ Register Teams App"),
+        ("check_teams_channel", "☐ Configure Teams Channel in Bot"),
+        ("check_verify_teams", "☐ Test Teams Integration"),
+    )),
+    ("7. Network Security & Isolation", "net_sec_checks", (
+        ("check_vnet_integration", "☐ Verify all services are inside Virtual Network or have Private Endpoints"),
+        ("check_apim_access", "☐ Verify APIM is accessible through Application Gateway only"),
+        ("check_nsgs", "☐ Configure NSGs for all subnets with proper rules"),
+        ("check_app_restrictions", "☐ Verify App Service access restrictions are configured"),
+        ("check_bastion", "☐ Configure Azure Bastion or Jump server for admin access"),
+    )),
+    ("8. WAF & DDoS Protection", "waf_checks", (
+        ("check_waf_block", "☐ Configure WAF in Block Mode with OWASP rules"),
+        ("check_ddos", "☐ Configure DDoS protection"),
+        ("check_waf_test", "☐ Test WAF rules with sample attacks"),
+        ("check_waf_exclusions", "☐ Review and customize WAF rule exclusions if needed"),
+    )),
+    ("9. Logging & Monitoring", "log_checks", (
+        ("check_diag_settings", "☐ Configure diagnostic settings for all resources"),
+        ("check_log_retention", "☐ Set up Log Analytics workspace with appropriate retention (min 3 months)"),
+        ("check_alerts", "☐ Configure alerts for critical errors"),
+        ("check_monitor", "☐ Set up Azure Monitor or integrate with SIEM if available"),
+        ("check_log_types", "☐ Verify all key logs are being captured (HTTP access, errors, auth, DB)"),
+    )),
+    ("10. HTTPS & Security Headers", "https_checks", (
+        ("check_https", "☐ Enforce HTTPS for all services"),
+        ("check_tls", "☐ Configure TLS 1.2+ and disable older protocols"),
+        ("check_sec_headers", "☐ Configure security headers"),
+        ("check_ssl_test", "☐ Test HTTPS configuration with SSL Labs or similar tool"),
+    )),
+    ("11. Production Environment Security", "prod_sec_checks", (
+        ("check_prod_keys", "☐ Verify production keys and secrets are different from test environment"),
+        ("check_firewall", "☐ Properly scope firewall rules to minimize exposure"),
+        ("check_pam_pim", "☐ Configure Azure PAM/PIM for administrative access"),
+        ("check_test_data", "☐ Remove any test data from production environment"),
+    )),
+    ("12. Final Verification", "final_checks", (
+        ("check_sec_scan", "☐ Run a security scan on all exposed endpoints"),
+        ("check_test_teams", "☐ Test the bot in Teams"),
+        ("check_costs", "☐ Verify resource costs are within budget"),
+        ("check_document", "☐ Document environment configuration and access procedures"),
+    )),
+)
+# Persistence group -> the check ids it holds
+_CHECKLIST_GROUP_IDS = {group: tuple(widget_key for widget_key, _ in items) for _, group, items in CHECKLIST_SPEC}
+
+# Tooltips for individual checklist items
+_CHECKLIST_HELP = {
+    "check_sec_headers": """
+        Configure the following security headers:
+        - Cache-Control: no-store
+        - Content-Security-Policy with appropriate settings
+        - Permissions-Policy
+        - Referrer-Policy
+        - Strict-Transport-Security
+        - X-Content-Type-Options
+        - X-Frame-Options
+        - X-XSS-Protection
+        - Cross-Origin policies
+        """,
+}
+
+# Verification scripts shown next to the network security checks
+_CHECKLIST_SCRIPTS = {
+    "check_vnet_integration": """
     # Check if resources are in VNet or have private endpoints
     # Run these commands and review the output for each service
 
@@ -1338,16 +1404,8 @@ def create_deployment_checklist_tab():
     # 6. List all resources not behind private endpoints
     echo "Resources that may not be properly isolated:"
     az resource list --resource-group $RG_NAME --query "[?type!='Microsoft.Network/virtualNetworks' && type!='Microsoft.Network/privateEndpoints'].{Name:name, Type:type}" -o table
-                """, language="bash")
-        
-        # Check 2: Verify APIM access through App Gateway
-        col1, col2 = st.columns([1, 3])
-        with col1:
-            net_sec_checks[1] = st.checkbox("☐ Verify APIM is accessible through Application Gateway only", 
-                                            value=net_sec_checks[1], key="check_apim_access")
-        with col2:
-            if st.button("Show Verification Script", key="script_apim_check"):
-                st.code("""
+                """,
+    "check_apim_access": """
     # Check APIM network configuration
     echo "Checking APIM network configuration..."
 
@@ -1385,16 +1443,8 @@ def create_deployment_checklist_tab():
     echo "  1. Try to access APIM directly: curl -I https://$APIM_NAME.azure-api.net"
     echo "  2. Then try through Application Gateway: curl -I http://$AGW_PIP_FQDN"
     echo "  The first request should fail if APIM is properly isolated"
-                """, language="bash")
-        
-        # Check 3: Verify NSG rules
-        col1, col2 = st.columns([1, 3])
-        with col1:
-            net_sec_checks[2] = st.checkbox("☐ Configure NSGs for all subnets with proper rules", 
-                                            value=net_sec_checks[2], key="check_nsgs")
-        with col2:
-            if st.button("Show Verification Script", key="script_nsg_check"):
-                st.code("""
+                """,
+    "check_nsgs": """
     # List and verify NSGs on all subnets
     echo "Checking NSG configurations for all subnets..."
 
@@ -1448,16 +1498,8 @@ def create_deployment_checklist_tab():
         echo "WARNING: No flow logs configured for NSG: $NSG"
     fi
     done
-                """, language="bash")
-        
-        # Check 4: Verify App Service access restrictions
-        col1, col2 = st.columns([1, 3])
-        with col1:
-            net_sec_checks[3] = st.checkbox("☐ Verify App Service access restrictions are configured", 
-                                            value=net_sec_checks[3], key="check_app_restrictions")
-        with col2:
-            if st.button("Show Verification Script", key="script_app_restriction_check"):
-                st.code("""
+                """,
+    "check_app_restrictions": """
     # Check App Service network access restrictions
     echo "Checking App Service network access restrictions..."
 
@@ -1510,16 +1552,8 @@ def create_deployment_checklist_tab():
     else
     echo "WARNING: App Service outbound traffic is not forced through VNet"
     fi
-                """, language="bash")
-        
-        # Check 5: Verify Bastion/Jump server
-        col1, col2 = st.columns([1, 3])
-        with col1:
-            net_sec_checks[4] = st.checkbox("☐ Configure Azure Bastion or Jump server for admin access", 
-                                            value=net_sec_checks[4], key="check_bastion")
-        with col2:
-            if st.button("Show Verification Script", key="script_bastion_check"):
-                st.code("""
+                """,
+    "check_bastion": """
     # Check if Azure Bastion is configured
     echo "Checking for Azure Bastion or Jump Server..."
 
@@ -1574,81 +1608,53 @@ def create_deployment_checklist_tab():
     echo "2. Verify policies exist that require MFA for administrative access"
     echo "3. Ensure policies target admin roles for Azure resources"
     echo "NOTE: Conditional Access configuration cannot be checked via CLI"
-                """, language="bash")
-        
-        # Add a section for network diagram generation
-        st.subheader("Network Diagram Generation")
-        if st.button("Generate Network Architecture Diagram", key="gen_network_diagram"):
-            st.info("This would generate a network architecture diagram showing VNets, subnets, NSGs, and connectivity between resources.")
-            st.markdown("For a comprehensive network security assessment, consider using:")
-            st.markdown("- [Azure Network Watcher](https://learn.microsoft.com/en-us/azure/network-watcher/)")
-            st.markdown("- [Azure Defender for Cloud](https://learn.microsoft.com/en-us/azure/defender-for-cloud/)")
-            st.markdown("- [Microsoft Defender for Cloud Apps](https://learn.microsoft.com/en-us/defender-cloud-apps/)")
-            
-    with st.expander("8. WAF & DDoS Protection", expanded=True):
-        if "waf_checks" not in st.session_state.checklist_state:
-            st.session_state.checklist_state["waf_checks"] = [False, False, False, False]
-        
-        waf_checks = st.session_state.checklist_state["waf_checks"]
-        waf_checks[0] = st.checkbox("☐ Configure WAF in Block Mode with OWASP rules", value=waf_checks[0], key="check_waf_block")
-        waf_checks[1] = st.checkbox("☐ Configure DDoS protection", value=waf_checks[1], key="check_ddos")
-        waf_checks[2] = st.checkbox("☐ Test WAF rules with sample attacks", value=waf_checks[2], key="check_waf_test")
-        waf_checks[3] = st.checkbox("☐ Review and customize WAF rule exclusions if needed", value=waf_checks[3], key="check_waf_exclusions")
-    
-    with st.expander("9. Logging & Monitoring", expanded=True):
-        if "log_checks" not in st.session_state.checklist_state:
-            st.session_state.checklist_state["log_checks"] = [False, False, False, False, False]
-        
-        log_checks = st.session_state.checklist_state["log_checks"]
-        log_checks[0] = st.checkbox("☐ Configure diagnostic settings for all resources", value=log_checks[0], key="check_diag_settings")
-        log_checks[1] = st.checkbox("☐ Set up Log Analytics workspace with appropriate retention (min 3 months)", value=log_checks[1], key="check_log_retention")
-        log_checks[2] = st.checkbox("☐ Configure alerts for critical errors", value=log_checks[2], key="check_alerts")
-        log_checks[3] = st.checkbox("☐ Set up Azure Monitor or integrate with SIEM if available", value=log_checks[3], key="check_monitor")
-        log_checks[4] = st.checkbox("☐ Verify all key logs are being captured (HTTP access, errors, auth, DB)", value=log_checks[4], key="check_log_types")
-    
-    with st.expander("10. HTTPS & Security Headers", expanded=True):
-        if "https_checks" not in st.session_state.checklist_state:
-            st.session_state.checklist_state["https_checks"] = [False, False, False, False]
-        
-        https_checks = st.session_state.checklist_state["https_checks"]
-        https_checks[0] = st.checkbox("☐ Enforce HTTPS for all services", value=https_checks[0], key="check_https")
-        https_checks[1] = st.checkbox("☐ Configure TLS 1.2+ and disable older protocols", value=https_checks[1], key="check_tls")
-        
-        security_headers_tooltip = """
-        Configure the following security headers:
-        - Cache-Control: no-store
-        - Content-Security-Policy with appropriate settings
-        - Permissions-Policy
-        - Referrer-Policy
-        - Strict-Transport-Security
-        - X-Content-Type-Options
-        - X-Frame-Options
-        - X-XSS-Protection
-        - Cross-Origin policies
-        """
-        
-        https_checks[2] = st.checkbox("☐ Configure security headers", value=https_checks[2], key="check_sec_headers", help=security_headers_tooltip)
-        https_checks[3] = st.checkbox("☐ Test HTTPS configuration with SSL Labs or similar tool", value=https_checks[3], key="check_ssl_test")
-    
-    with st.expander("11. Production Environment Security", expanded=True):
-        if "prod_sec_checks" not in st.session_state.checklist_state:
-            st.session_state.checklist_state["prod_sec_checks"] = [False, False, False, False]
-        
-        prod_sec_checks = st.session_state.checklist_state["prod_sec_checks"]
-        prod_sec_checks[0] = st.checkbox("☐ Verify production keys and secrets are different from test environment", value=prod_sec_checks[0], key="check_prod_keys")
-        prod_sec_checks[1] = st.checkbox("☐ Properly scope firewall rules to minimize exposure", value=prod_sec_checks[1], key="check_firewall")
-        prod_sec_checks[2] = st.checkbox("☐ Configure Azure PAM/PIM for administrative access", value=prod_sec_checks[2], key="check_pam_pim")
-        prod_sec_checks[3] = st.checkbox("☐ Remove any test data from production environment", value=prod_sec_checks[3], key="check_test_data")
+                """,
+}
+
+def _flush_checklist():
+    """Copy submitted checklist values into checklist_state and persist the changed groups"""
+    # Bind the proxies once; the submitted values are gathered per group and written in one update
+    session_state = st.session_state
+    checklist_state = session_state.checklist_state
+    for group, check_ids in _CHECKLIST_GROUP_IDS.items():
+        values = {check_id: session_state[check_id] for check_id in check_ids}
+        if any(checklist_state.get(check_id, False) != value for check_id, value in values.items()):
+            checklist_state.update(values)
+            save_checklist_group(group, check_ids)
+
+@st.fragment
+def create_deployment_checklist_tab():
+    """Create the Deployment Checklist tab with comprehensive security checks"""
+    st.header("Deployment Checklist")
     
-    with st.expander("12. Final Verification", expanded=True):
-        if "final_checks" not in st.session_state.checklist_state:
-            st.session_state.checklist_state["final_checks"] = [False, False, False, False]
-        
-        final_checks = st.session_state.checklist_state["final_checks"]
-        final_checks[0] = st.checkbox("☐ Run a security scan on all exposed endpoints", value=final_checks[0], key="check_sec_scan")
-        final_checks[1] = st.checkbox("☐ Test the bot in Teams", value=final_checks[1], key="check_test_teams")
-        final_checks[2] = st.checkbox("☐ Verify resource costs are within budget", value=final_checks[2], key="check_costs")
-        final_checks[3] = st.checkbox("☐ Document environment configuration and access procedures", value=final_checks[3], key="check_document")
+    # Flat check id -> bool mapping; unseen checks start unticked
+    checklist_state = st.session_state.checklist_state
+    
+    # Toggles are batched in a form so ticking a box does not rerun the whole app
+    with st.form("checklist_form", clear_on_submit=False):
+        for title, _, items in CHECKLIST_SPEC:
+            with st.expander(title, expanded=True):
+                for widget_key, label in items:
+                    if widget_key in _CHECKLIST_SCRIPTS:
+                        col1, col2 = st.columns([1, 3])
+                        with col1:
+                            st.checkbox(label, value=checklist_state.get(widget_key, False), key=widget_key, help=_CHECKLIST_HELP.get(widget_key))
+                        with col2:
+                            with st.popover("Show Verification Script"):
+                                st.code(_CHECKLIST_SCRIPTS[widget_key], language="bash")
+                    else:
+                        st.checkbox(label, value=checklist_state.get(widget_key, False), key=widget_key, help=_CHECKLIST_HELP.get(widget_key))
+        
+        st.form_submit_button("Save progress", on_click=_flush_checklist)
+    
+    # Add a section for network diagram generation
+    st.subheader("Network Diagram Generation")
+    if st.button("Generate Network Architecture Diagram", key="gen_network_diagram"):
+        st.info("This would generate a network architecture diagram showing VNets, subnets, NSGs, and connectivity between resources.")
+        st.markdown("For a comprehensive network security assessment, consider using:")
+        st.markdown("- [Azure Network Watcher](https://learn.microsoft.com/en-us/azure/network-watcher/)")
+        st.markdown("- [Azure Defender for Cloud](https://learn.microsoft.com/en-us/azure/defender-for-cloud/)")
+        st.markdown("- [Microsoft Defender for Cloud Apps](https://learn.microsoft.com/en-us/defender-cloud-apps/)")
     
     # Security guidelines section
     st.header("Security Guidelines Reference")
@@ -1759,6 +1765,7 @@ def create_deployment_checklist_tab():
         - If access is limited to specific IPs, configure 403 redirect to notification page
         """)
 
+@st.fragment
 def create_api_import_section(api_management_tab=None):
     """
     Create a section for importing API definitions from Postman or Swagger JSON
@@ -1783,8 +1790,8 @@ def create_api_import_section(api_management_tab=None):
             
             if uploaded_postman is not None:
                 try:
-                    # Parse the uploaded JSON
-                    postman_data = json.load(uploaded_postman)
+                    # Parse the uploaded JSON, skipping a UTF-8 BOM that orjson would reject
+                    postman_data = orjson.loads(uploaded_postman.getvalue().removeprefix(codecs.BOM_UTF8))
                     
                     # Display collection information
                     if "info" in postman_data:
@@ -1828,8 +1835,8 @@ def create_api_import_section(api_management_tab=None):
             
             if uploaded_swagger is not None:
                 try:
-                    # Parse the uploaded JSON
-                    swagger_data = json.load(uploaded_swagger)
+                    # Parse the uploaded JSON, skipping a UTF-8 BOM that orjson would reject
+                    swagger_data = orjson.loads(uploaded_swagger.getvalue().removeprefix(codecs.BOM_UTF8))
                     
                     # Display API information
                     if "info" in swagger_data:
@@ -1875,8 +1882,8 @@ def create_api_import_section(api_management_tab=None):
                 
                 if uploaded_postman is not None:
                     try:
-                        # Parse the uploaded JSON
-                        postman_data = json.load(uploaded_postman)
+                        # Parse the uploaded JSON, skipping a UTF-8 BOM that orjson would reject
+                        postman_data = orjson.loads(uploaded_postman.getvalue().removeprefix(codecs.BOM_UTF8))
                         
                         # Display collection information
                         if "info" in postman_data:
@@ -1920,8 +1927,8 @@ def create_api_import_section(api_management_tab=None):
                 
                 if uploaded_swagger is not None:
                     try:
-                        # Parse the uploaded JSON
-                        swagger_data = json.load(uploaded_swagger)
+                        # Parse the uploaded JSON, skipping a UTF-8 BOM that orjson would reject
+                        swagger_data = orjson.loads(uploaded_swagger.getvalue().removeprefix(codecs.BOM_UTF8))
                         
                         # Display API information
                         if "info" in swagger_data:
@@ -1952,8 +1959,31 @@ def create_api_import_section(api_management_tab=None):
                     except Exception as e:
                         st.error(f"Error parsing Swagger/OpenAPI: {str(e)}")
                     
+# Script section labels, in display order, mapped to their generated_scripts keys
+SECTION_MAP = {
+    "Complete Script": "complete_script",
+    "Environment Variables": "environment_vars",
+    "Resource Group": "resource_group",
+    "API Management": "api_management",
+    "Networking": "networking",
+    "App Service": "app_service",
+    "Data & AI": "data_ai_services",
+    "Web App": "web_app",
+    "Bot Service": "bot_service",
+    "Teams Integration": "teams_integration",
+    "Network Verification": "network_verification",
+}
+# Radio options, in display order
+SECTION_NAMES = tuple(SECTION_MAP)
+
+@st.fragment
 def display_output_section(env):
-    """Display the output section with the selected script"""
+    """Display the output section with the selected script
+    
+    Runs as a fragment so picking a script section only reruns this section.
+    Edits inside the tab fragments above never rerun it, so the script is only
+    re-sent on a full app run (sidebar change or Generate) or a section switch.
+    """
     if not st.session_state.script_generated:
         return
     
@@ -1966,8 +1996,7 @@ def display_output_section(env):
         # Updated order of script sections
         selected_section = st.radio(
             "Script Sections", 
-            ["Complete Script", "Environment Variables", "Resource Group", "API Management", "Networking", "App Service", 
-             "Data & AI", "Web App", "Bot Service", "Teams Integration", "Network Verification"],
+            SECTION_NAMES,
             key="section_selector"
         )
         st.session_state.selected_section = selected_section
@@ -1975,22 +2004,88 @@ def display_output_section(env):
         # Add option to download everything as JSON
         if st.button("Export All Settings", key="export_all_settings_output"):
             # Use the get_all_settings function to get structured settings
-            from state import get_all_settings
             all_settings = get_all_settings()
             
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            download_link = get_full_settings_download_link(
-                all_settings, 
-                f"anpi_full_settings_{timestamp}.json"
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            st.download_button(
+                label="Download Complete Settings",
+                data=get_settings_json(all_settings),
+                file_name=f"anpi_full_settings_{timestamp}.json",
+                mime="application/json",
+                key="download_all_settings_output"
             )
-            st.markdown(download_link, unsafe_allow_html=True)
             st.success("All settings exported successfully!")
     
     with col2:
-        show_selected_section(env)
+        # Reuse one element slot for the script so switching sections updates it in place
+        code_slot = st.empty()
+        show_selected_section(env, code_slot)
+
+# lru_cache rather than st.cache_data: the key is a tuple of str, whose hashes Python caches,
+# while st.cache_data would re-serialise and digest every script and copy the result per call
+@functools.lru_cache(maxsize=8)
+def _cached_markdown(scripts_items, env):
+    """Build the markdown export once per distinct set of scripts and environment
+    
+    Args:
+        scripts_items (tuple): Sorted (key, script) pairs, hashable for the cache key
+        env (str): Environment name (dev, test, etc.)
+    """
+    return create_markdown_content(dict(scripts_items), env)
+
+def _render_complete_downloads(scripts, env):
+    """Render the script and markdown downloads for the Complete Script section"""
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="Download Complete Script",
+            data=scripts["complete_script"],
+            file_name=f"azure-anpi-bot-deploy-{env}.sh",
+            mime="text/plain"
+        )
+    
+    with col2:
+        # Create markdown content
+        markdown_content = _cached_markdown(tuple(sorted(scripts.items())), env)
+        st.download_button(
+            label="Download Markdown",
+            data=markdown_content,
+            file_name=f"azure-anpi-bot-deploy-{env}.md",
+            mime="text/markdown"
+        )
 
-def show_selected_section(env):
-    """Display the selected script section"""
+def _render_apim_yaml(scripts, env):
+    """Render the API configuration YAML download for the API Management section"""
+    # Add YAML download button for API Management
+    st.markdown("### API Configuration YAML")
+    st.markdown("Tải xuống tệp YAML mẫu cho việc cấu hình API. Bạn có thể chỉnh sửa tệp này và nhập vào Azure Portal.")
+    
+    # Get APIM details from session state, reading sidebar_values through the proxy once
+    sv = st.session_state.sidebar_values
+    api_display_name = sv.get('api_display_name', 'ANPI Bot API')
+    
+    # Serve the YAML bytes directly; a download button needs no base64 data URL
+    st.download_button(
+        label="Download OpenAPI YAML",
+        data=get_openapi_yaml(api_display_name, env),
+        file_name=f"anpi_bot_api_{env}.openapi.yaml",
+        mime="application/yaml",
+        key="download_openapi_yaml_output"
+    )
+
+# Extra content rendered below the script, by section label
+SECTION_RENDERERS = {
+    "Complete Script": _render_complete_downloads,
+    "API Management": _render_apim_yaml,
+}
+
+def show_selected_section(env, code_slot):
+    """Display the selected script section
+    
+    Args:
+        env (str): Environment (dev, test, etc.)
+        code_slot: st.empty() placeholder that receives the script code block
+    """
     if not st.session_state.script_generated:
         st.warning("Please generate the CLI commands first.")
         return
@@ -1998,62 +2093,12 @@ def show_selected_section(env):
     selected_section = st.session_state.selected_section
     scripts = st.session_state.generated_scripts
     
-    if selected_section == "Complete Script":
-        st.code(scripts["complete_script"], language="bash")
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            st.download_button(
-                label="Download Complete Script",
-                data=scripts["complete_script"],
-                file_name=f"azure-anpi-bot-deploy-{env}.sh",
-                mime="text/plain"
-            )
-        
-        with col2:
-            # Create markdown content
-            markdown_content = create_markdown_content(scripts, env)
-            st.markdown(
-                get_markdown_download_link(markdown_content, f"azure-anpi-bot-deploy-{env}.md"),
-                unsafe_allow_html=True
-            )
+    code_slot.code(scripts[SECTION_MAP[selected_section]], language="bash")
     
-    elif selected_section == "Environment Variables":
-        st.code(scripts["environment_vars"], language="bash")
-    elif selected_section == "Resource Group":
-        st.code(scripts["resource_group"], language="bash")
-    elif selected_section == "Networking":
-        st.code(scripts["networking"], language="bash")
-    elif selected_section == "App Service":
-        st.code(scripts["app_service"], language="bash")
-    elif selected_section == "Data & AI":
-        st.code(scripts["data_ai_services"], language="bash")
-    elif selected_section == "API Management":
-        st.code(scripts["api_management"], language="bash")
-        
-        # Add YAML download button for API Management
-        st.markdown("### API Configuration YAML")
-        st.markdown("Tải xuống tệp YAML mẫu cho việc cấu hình API. Bạn có thể chỉnh sửa tệp này và nhập vào Azure Portal.")
-        
-        # Get APIM details from session state
-        apim_name = st.session_state.sidebar_values.get('apim_name', 'apim-itz')
-        api_path = st.session_state.sidebar_values.get('api_path', 'anpi')
-        api_id = st.session_state.sidebar_values.get('api_id', 'anpi-bot-api')
-        api_display_name = st.session_state.sidebar_values.get('api_display_name', 'ANPI Bot API')
-        app_name = st.session_state.sidebar_values.get('app_name', f'app-itz-anpi-{env}-001')
-        
-        # Create download link
-        yaml_download_link = get_yaml_download_link(api_display_name, env, app_name)
-        st.markdown(yaml_download_link, unsafe_allow_html=True)
-    
-    elif selected_section == "Web App":
-        st.code(scripts["web_app"], language="bash")
-    elif selected_section == "Bot Service":
-        st.code(scripts["bot_service"], language="bash")
-    elif selected_section == "Teams Integration":
-        st.code(scripts["teams_integration"], language="bash")
-    elif selected_section == "Network Verification":
-        st.code(scripts["network_verification"], language="bash")
+    # Sections with extra downloads below the script
+    renderer = SECTION_RENDERERS.get(selected_section)
+    if renderer:
+        renderer(scripts, env)
 
 def create_footer():
     """Create footer with info text"""
@@ -2078,25 +2123,36 @@ def create_arm_template_section(networking_settings, env, location):
     st.info("Generate an ARM template for the Application Gateway with proper configuration.")
     
     # Get values from the networking settings
-    agw_name = networking_settings.get('agw_name', f"agw-itz-{env}-jpe-001")
-    vnet_name = networking_settings.get('vnet_name', f"vnet-itz-{env}-jpe-001")
-    subnet_name = networking_settings.get('subnet_name', f"snet-itz-{env}-jpe-001")
-    pip_name = networking_settings.get('pip_name', f"pip-itz-anpi-{env}-jpe-001")
-    waf_name = networking_settings.get('waf_name', f"waf-itz-{env}-jpe-001")
+    defaults = compute_default_names(env)
+    agw_name = networking_settings.get('agw_name', defaults['agw_name'])
+    vnet_name = networking_settings.get('vnet_name', defaults['vnet_name'])
+    subnet_name = networking_settings.get('subnet_name', defaults['subnet_name'])
+    pip_name = networking_settings.get('pip_name', defaults['pip_name'])
+    waf_name = networking_settings.get('waf_name', defaults['waf_name'])
+    
+    # Keyed inputs keep their own state and ignore later value= changes, so refill them
+    # whenever the networking values they start from change
+    arm_defaults = {
+        "arm_agw_name": agw_name,
+        "arm_vnet_name": vnet_name,
+        "arm_subnet_name": subnet_name,
+        "arm_pip_name": pip_name,
+        "arm_waf_name": waf_name,
+    }
+    if st.session_state.get('_arm_template_defaults') != arm_defaults or any(key not in st.session_state for key in arm_defaults):
+        st.session_state.update(arm_defaults)
+        st.session_state['_arm_template_defaults'] = arm_defaults
     
     # Allow customization of key values with unique keys
     st.subheader("ARM Template Options")
-    custom_agw_name = st.text_input("Application Gateway Name", value=agw_name, key="arm_agw_name")
-    custom_vnet_name = st.text_input("Virtual Network Name", value=vnet_name, key="arm_vnet_name")
-    custom_subnet_name = st.text_input("Subnet Name", value=subnet_name, key="arm_subnet_name")
-    custom_pip_name = st.text_input("Public IP Name", value=pip_name, key="arm_pip_name")
-    custom_waf_name = st.text_input("WAF Policy Name", value=waf_name, key="arm_waf_name")
+    custom_agw_name = st.text_input("Application Gateway Name", key="arm_agw_name")
+    custom_vnet_name = st.text_input("Virtual Network Name", key="arm_vnet_name")
+    custom_subnet_name = st.text_input("Subnet Name", key="arm_subnet_name")
+    custom_pip_name = st.text_input("Public IP Name", key="arm_pip_name")
+    custom_waf_name = st.text_input("WAF Policy Name", key="arm_waf_name")
     
     # Add button to generate ARM template
     if st.button("Generate ARM Template", key="generate_arm_template"):
-        # Import function for generating download link
-        from utils import get_arm_template_download_link
-        
         # Generate the download link
         download_link = get_arm_template_download_link(
             custom_agw_name,
@@ -1,30 +1,52 @@
 """
 Utility functions for the Azure ANPI Bot Infrastructure Generator.
 """
-import base64
+try:
+    # SIMD-accelerated, drop-in compatible encoder; fall back to the standard library
+    import pybase64 as base64
+    # Encodes straight into a str, without an intermediate bytes object to decode
+    _b64encode_str = base64.b64encode_as_string
+except ImportError:
+    import base64
+
+    def _b64encode_str(data):
+        """Base64-encode bytes into an ASCII str"""
+        return base64.b64encode(data).decode('ascii')
+import codecs
+import functools
 import json
-import random
+import orjson
+import secrets
 import string
-from datetime import datetime
+import time
 import io
 import zipfile
-from PIL import Image
 import os
 
-def get_markdown_download_link(md_content, filename):
+def _data_url_link(mime, data, filename, label, css_class="download-button"):
     """
-    Create a downloadable link for Markdown content
+    Build an HTML download link that embeds content as a base64 data URL
     
     Args:
-        md_content (str): Markdown content to download
+        mime (str): MIME type used in the data URL (e.g., 'file/json')
+        data (bytes): Content to embed
         filename (str): Name of the file to download
+        label (str): Link text
+        css_class (str): CSS class of the link, or None for no class attribute
         
     Returns:
         str: HTML link for downloading the content
     """
-    b64 = base64.b64encode(md_content.encode()).decode()
-    href = f'<a href="data:file/markdown;base64,{b64}" download="{filename}" class="download-button">📄 Download Markdown</a>'
-    return href
+    class_attr = f' class="{css_class}"' if css_class else ''
+    return f'<a href="data:{mime};base64,{_b64encode_str(data)}" download="{filename}"{class_attr}>{label}</a>'
+
+# A mix of letters, numbers and special characters for JWT secrets
+_JWT_SECRET_CHARACTERS = string.ascii_letters + string.digits + "!@#$%^&*()-_=+[]{}|;:,.<>?/"
+# Random bytes are mapped onto the alphabet with bytes.translate. Bytes at or above the
+# largest multiple of the alphabet size are dropped so every character stays equally likely.
+_JWT_SECRET_LIMIT = 256 - 256 % len(_JWT_SECRET_CHARACTERS)
+_JWT_SECRET_TABLE = bytes(ord(_JWT_SECRET_CHARACTERS[i % len(_JWT_SECRET_CHARACTERS)]) for i in range(256))
+_JWT_SECRET_REJECT = bytes(range(_JWT_SECRET_LIMIT, 256))
 
 def generate_jwt_secret():
     """
@@ -33,11 +55,11 @@ def generate_jwt_secret():
     Returns:
         str: A random string suitable for use as a JWT secret
     """
-    # Create a mix of letters, numbers and special characters
-    characters = string.ascii_letters + string.digits + "!@#$%^&*()-_=+[]{}|;:,.<>?/"
-    # Generate a random string of 40 characters
-    jwt_secret = ''.join(random.choice(characters) for _ in range(40))
-    return jwt_secret
+    # Generate a random string of 40 characters from the OS CSPRNG; random.choice is not fit for secrets
+    jwt_secret = b''
+    while len(jwt_secret) < 40:
+        jwt_secret += secrets.token_bytes(64).translate(_JWT_SECRET_TABLE, _JWT_SECRET_REJECT)
+    return jwt_secret[:40].decode('ascii')
 
 def create_markdown_content(scripts, env):
     """
@@ -52,7 +74,7 @@ def create_markdown_content(scripts, env):
     """
     return f"""# Azure ANPI Bot Deployment Script
 
-Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} for environment: {env}
+Generated on {time.strftime('%Y-%m-%d %H:%M:%S')} for environment: {env}
 
 ## Environment Variables
 ```bash
@@ -106,21 +128,17 @@ Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} for environment: {en
 """
 
 
-def get_settings_download_link(settings, filename):
+def get_settings_json(settings):
     """
-    Create a downloadable link for settings as JSON
+    Serialize settings to indented JSON for downloading
     
     Args:
-        settings (dict): Settings dictionary to download
-        filename (str): Name of the file to download
+        settings (dict): Settings dictionary to serialize
         
     Returns:
-        str: HTML link for downloading the settings
+        bytes: UTF-8 encoded JSON document
     """
-    settings_json = json.dumps(settings, indent=2)
-    b64 = base64.b64encode(settings_json.encode()).decode()
-    href = f'<a href="data:file/json;base64,{b64}" download="{filename}">Download Settings</a>'
-    return href
+    return orjson.dumps(settings, option=orjson.OPT_INDENT_2)
 
 def parse_uploaded_settings(uploaded_file):
     """
@@ -133,50 +151,18 @@ def parse_uploaded_settings(uploaded_file):
         dict: Parsed settings dictionary or None if parsing failed
     """
     try:
-        content = uploaded_file.read()
-        settings = json.loads(content)
+        # UploadedFile is a BytesIO; parse its buffer in place instead of copying it out,
+        # releasing the view afterwards so the file object stays usable
+        with uploaded_file.getbuffer() as content:
+            # Files saved by Windows tools can start with a UTF-8 BOM, which orjson rejects
+            start = len(codecs.BOM_UTF8) if content[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+            settings = orjson.loads(content[start:])
         return settings
-    except Exception as e:
+    except orjson.JSONDecodeError:
         return None
         
-def get_full_settings_download_link(settings, filename):
-    """
-    Create a downloadable link for full application settings as JSON
-    
-    Args:
-        settings (dict): Full settings dictionary to download
-        filename (str): Name of the file to download
-        
-    Returns:
-        str: HTML link for downloading the settings
-    """
-    settings_json = json.dumps(settings, indent=2)
-    b64 = base64.b64encode(settings_json.encode()).decode()
-    href = f'<a href="data:file/json;base64,{b64}" download="{filename}" class="download-button">Download Complete Settings</a>'
-    return href
-
-def get_yaml_download_link(api_display_name, env, app_name, apim_name="apim-itz-fjp", api_path="anpi"):
-    """
-    Create a downloadable link for OpenAPI YAML file
-    
-    Args:
-        api_display_name (str): Display name for the API
-        env (str): Environment (dev, test, etc.)
-        app_name (str): App Service name
-        apim_name (str): API Management service name
-        api_path (str): API path
-        
-    Returns:
-        str: HTML link for downloading the YAML file
-    """
-    yaml_content = f"""openapi: 3.0.1
-info:
-  title: {api_display_name}
-  description: API for FJP ANPI Safety Confirmation System Bot - {env.upper()}
-  version: '1.0'
-servers:
-  - url: https://{apim_name}.azure-api.net/{api_path}
-paths:
+# Static part of the OpenAPI YAML that follows the servers block
+_OPENAPI_YAML_TAIL = b"""paths:
   /api/auth/token:
     post:
       tags:
@@ -694,13 +680,33 @@ security:
   - apiKeyHeader: [ ]
   - apiKeyQuery: [ ]
 """
-    b64 = base64.b64encode(yaml_content.encode()).decode()
-    href = f'<a href="data:file/yaml;base64,{b64}" download="anpi_bot_api_{env}.openapi.yaml">Download OpenAPI YAML</a>'
-    return href
-  
-def get_arm_template_download_link(app_gw_name, vnet_name, subnet_name, pip_name, environment, location):
+def get_openapi_yaml(api_display_name, env, apim_name="apim-itz-fjp", api_path="anpi"):
     """
-    Create a downloadable ARM template for Application Gateway with WAF configuration
+    Generate the OpenAPI YAML file content
+    
+    Args:
+        api_display_name (str): Display name for the API
+        env (str): Environment (dev, test, etc.)
+        apim_name (str): API Management service name
+        api_path (str): API path
+        
+    Returns:
+        bytes: UTF-8 encoded YAML document, ready for st.download_button
+    """
+    yaml_head = f"""openapi: 3.0.1
+info:
+  title: {api_display_name}
+  description: API for FJP ANPI Safety Confirmation System Bot - {env.upper()}
+  version: '1.0'
+servers:
+  - url: https://{apim_name}.azure-api.net/{api_path}
+""".encode()
+    return yaml_head + _OPENAPI_YAML_TAIL
+
+@functools.lru_cache(maxsize=16)
+def _arm_template_json(app_gw_name, vnet_name, subnet_name, pip_name, environment, location):
+    """
+    Build the Application Gateway ARM template and serialize it to indented JSON
     
     Args:
         app_gw_name (str): Application Gateway name
@@ -711,7 +717,7 @@ def get_arm_template_download_link(app_gw_name, vnet_name, subnet_name, pip_name
         location (str): Azure region
         
     Returns:
-        str: HTML link for downloading the template
+        bytes: UTF-8 encoded template JSON
     """
     # Create the ARM template
     template = {
@@ -884,18 +890,33 @@ def get_arm_template_download_link(app_gw_name, vnet_name, subnet_name, pip_name
         }
     }
     
-    # Convert template to JSON string with proper indentation
-    template_json = json.dumps(template, indent=2)
+    # orjson returns UTF-8 bytes ready for encoding
+    return orjson.dumps(template, option=orjson.OPT_INDENT_2)
+
+def get_arm_template_download_link(app_gw_name, vnet_name, subnet_name, pip_name, environment, location):
+    """
+    Create a downloadable ARM template for Application Gateway with WAF configuration
     
-    # Convert to base64 for download link
-    template_b64 = base64.b64encode(template_json.encode('utf-8')).decode('utf-8')
+    Args:
+        app_gw_name (str): Application Gateway name
+        vnet_name (str): VNet name
+        subnet_name (str): Subnet name
+        pip_name (str): Public IP name
+        environment (str): Environment name (e.g., Dev, Test, Prod)
+        location (str): Azure region
+        
+    Returns:
+        str: HTML link for downloading the template
+    """
+    # Serialized once per distinct set of names; only the filename timestamp changes per call
+    template_json = _arm_template_json(app_gw_name, vnet_name, subnet_name, pip_name, environment, location)
     
     # Generate filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     filename = f"appgateway_{environment.lower()}_{timestamp}.json"
     
     # Create HTML download link
-    href = f'<a href="data:application/json;base64,{template_b64}" download="{filename}" class="download-button">📥 Download ARM Template</a>'
+    href = _data_url_link("application/json", template_json, filename, "📥 Download ARM Template")
     
     # Add deployment instructions
     deployment_instructions = f"""
@@ -934,6 +955,7 @@ az network application-gateway address-pool update \\
     
     return href + deployment_instructions
 
+@functools.lru_cache(maxsize=32)
 def get_search_index_json(index_name, semantic_config_name):
     """
     Generate JSON for search index configuration
@@ -1155,8 +1177,9 @@ def get_search_index_json(index_name, semantic_config_name):
       }
     }
     
-    return json.dumps(index_json, indent=2)
+    return orjson.dumps(index_json, option=orjson.OPT_INDENT_2).decode()
 
+@functools.lru_cache(maxsize=32)
 def get_search_indexer_json(index_name):
     """
     Generate JSON for search indexer configuration
@@ -1182,7 +1205,7 @@ def get_search_indexer_json(index_name):
       "encryptionKey": None
     }
     
-    return json.dumps(indexer_json, indent=2)
+    return orjson.dumps(indexer_json, option=orjson.OPT_INDENT_2).decode()
 
 def get_json_download_link(json_content, filename):
     """
@@ -1195,10 +1218,9 @@ def get_json_download_link(json_content, filename):
     Returns:
         str: HTML link for downloading the content
     """
-    b64 = base64.b64encode(json_content.encode()).decode()
-    href = f'<a href="data:file/json;base64,{b64}" download="{filename}" class="download-button">📄 Download {filename}</a>'
-    return href
+    return _data_url_link("file/json", json_content.encode(), filename, f"📄 Download {filename}")
 
+@functools.lru_cache(maxsize=32)
 def get_search_datasource_json(cosmos_name, cosmos_db_name, index_name):
     """
     Generate JSON for search data source configuration
@@ -1229,7 +1251,7 @@ def get_search_datasource_json(cosmos_name, cosmos_db_name, index_name):
       "identity": None
     }
     
-    return json.dumps(datasource_json, indent=2)
+    return orjson.dumps(datasource_json, option=orjson.OPT_INDENT_2).decode()
 
 def get_initial_knowledge_json():
     """
@@ -1239,10 +1261,9 @@ def get_initial_knowledge_json():
         str: JSON string with initial knowledge entries
     """
     import uuid
-    from datetime import datetime, timezone
     
-    # Current time in ISO format with Z
-    current_time = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+    # Current UTC time in ISO format with Z
+    current_time = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
     
     # Create sample knowledge entries
     knowledge_entries = [
@@ -1999,14 +2020,14 @@ def get_initial_knowledge_json():
     }
   ]
     
-    return json.dumps(knowledge_entries, indent=2)
+    return orjson.dumps(knowledge_entries, option=orjson.OPT_INDENT_2).decode()
 
 def get_apim_policy_xml(allowed_origins):
     """
     Generate XML for API Management policy
     
     Args:
-        allowed_origins (str): JSON string containing allowed origins for CORS
+        allowed_origins (str or list): JSON string or pre-parsed list of allowed origins for CORS
         
     Returns:
         str: XML string with API policy
@@ -2014,7 +2035,7 @@ def get_apim_policy_xml(allowed_origins):
     try:
         # Try to parse the JSON string to get individual origins
         import json
-        origins = json.loads(allowed_origins)
+        origins = allowed_origins if isinstance(allowed_origins, list) else json.loads(allowed_origins)
         origin_tags = '\n        '.join([f'<origin>{origin}</origin>' for origin in origins])
     except:
         # If parsing fails, use default origins
@@ -2069,9 +2090,7 @@ def get_xml_download_link(xml_content, filename):
     Returns:
         str: HTML link for downloading the content
     """
-    b64 = base64.b64encode(xml_content.encode()).decode()
-    href = f'<a href="data:application/xml;base64,{b64}" download="{filename}" class="download-button">📄 Download {filename}</a>'
-    return href
+    return _data_url_link("application/xml", xml_content.encode(), filename, f"📄 Download {filename}")
 
 def generate_azure_pipeline_yaml(service_conn_name):
     """
@@ -2205,6 +2224,24 @@ stages:
     
     return yaml_content
 
+def _placeholder_png(size, color):
+    """
+    Render a square single-color PNG used when the Teams app icons are missing
+    
+    Args:
+        size (int): Width and height in pixels (96 for the color icon, 32 for the outline icon)
+        color (str): Fill color (e.g., '#0078D4')
+        
+    Returns:
+        bytes: PNG file content
+    """
+    # Pillow is slow to import and only needed for this fallback, so load it on first use
+    from PIL import Image
+    
+    img_bytes = io.BytesIO()
+    Image.new('RGB', (size, size), color=color).save(img_bytes, format='PNG')
+    return img_bytes.getvalue()
+
 def get_teams_app_manifest_download_link(app_name, bot_id, package_name, env):
     """
     Create a downloadable link for Teams app manifest ZIP file
@@ -2301,40 +2338,19 @@ def get_teams_app_manifest_download_link(app_name, bot_id, package_name, env):
                 zf.write(outline_path, 'outline.png')
             else:
                 # Create placeholder images if files don't exist
-                # Create a simple color image (96x96)
-                color_img = Image.new('RGB', (96, 96), color = '#0078D4')
-                color_img_bytes = io.BytesIO()
-                color_img.save(color_img_bytes, format='PNG')
-                zf.writestr('color.png', color_img_bytes.getvalue())
-                
-                # Create a simple outline image (32x32)
-                outline_img = Image.new('RGB', (32, 32), color = '#FFFFFF')
-                outline_img_bytes = io.BytesIO()
-                outline_img.save(outline_img_bytes, format='PNG')
-                zf.writestr('outline.png', outline_img_bytes.getvalue())
-        except Exception as e:
+                zf.writestr('color.png', _placeholder_png(96, '#0078D4'))
+                zf.writestr('outline.png', _placeholder_png(32, '#FFFFFF'))
+        except Exception:
             # If there's any error with the images, create placeholder images
-            # Create a simple color image (96x96)
-            color_img = Image.new('RGB', (96, 96), color = '#0078D4')
-            color_img_bytes = io.BytesIO()
-            color_img.save(color_img_bytes, format='PNG')
-            zf.writestr('color.png', color_img_bytes.getvalue())
-            
-            # Create a simple outline image (32x32)
-            outline_img = Image.new('RGB', (32, 32), color = '#FFFFFF')
-            outline_img_bytes = io.BytesIO()
-            outline_img.save(outline_img_bytes, format='PNG')
-            zf.writestr('outline.png', outline_img_bytes.getvalue())
+            zf.writestr('color.png', _placeholder_png(96, '#0078D4'))
+            zf.writestr('outline.png', _placeholder_png(32, '#FFFFFF'))
     
     # Reset file pointer to the beginning
     memory_file.seek(0)
     
-    # Create base64 encoded string
-    b64 = base64.b64encode(memory_file.getvalue()).decode()
-    
-    # Create download link
+    # Create download link; getbuffer() exposes the ZIP bytes without copying them out of the BytesIO
     file_name = f"anpi_teams_app_{env.lower()}.zip"
-    href = f'<a href="data:application/zip;base64,{b64}" download="{file_name}" class="download-button">📥 Download Teams App Package</a>'
+    href = _data_url_link("application/zip", memory_file.getbuffer(), file_name, "📥 Download Teams App Package")
     
     return href
   
@@ -2352,7 +2368,6 @@ def generate_postman_collection(api_display_name, env, api_path, apim_name, api_
     Returns:
         str: JSON string for the Postman collection
     """
-    import json
     import uuid
     
     # Generate a collection ID
@@ -2682,7 +2697,7 @@ def generate_postman_collection(api_display_name, env, api_path, apim_name, api_
         ]
     }
     
-    return json.dumps(collection, indent=2)
+    return orjson.dumps(collection, option=orjson.OPT_INDENT_2).decode()
 
 def get_postman_collection_download_link(api_display_name, env, api_path, apim_name, api_base_url):
     """
@@ -2698,21 +2713,15 @@ def get_postman_collection_download_link(api_display_name, env, api_path, apim_n
     Returns:
         str: HTML link for downloading the collection
     """
-    import base64
-    from datetime import datetime
-    
     # Generate the Postman collection JSON
     collection_json = generate_postman_collection(api_display_name, env, api_path, apim_name, api_base_url)
     
-    # Convert to base64 for download link
-    b64 = base64.b64encode(collection_json.encode()).decode()
-    
     # Create filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     filename = f"anpi_postman_collection_{env.lower()}_{timestamp}.json"
     
     # Create HTML download link
-    href = f'<a href="data:application/json;base64,{b64}" download="{filename}" class="download-button">📥 Download Postman Collection</a>'
+    href = _data_url_link("application/json", collection_json.encode(), filename, "📥 Download Postman Collection")
     
     return href
   
@@ -2729,8 +2738,6 @@ def generate_swagger_json(api_display_name, env, api_path, apim_name):
     Returns:
         str: JSON string for the Swagger/OpenAPI specification
     """
-    import json
-    
     # APIM endpoint URL
     apim_url = f"https://{apim_name}.azure-api.net/{api_path}"
     
@@ -3432,7 +3439,7 @@ def generate_swagger_json(api_display_name, env, api_path, apim_name):
         ]
     }
     
-    return json.dumps(swagger_spec, indent=2)
+    return orjson.dumps(swagger_spec, option=orjson.OPT_INDENT_2).decode()
 
 def get_swagger_json_download_link(api_display_name, env, api_path, apim_name):
     """
@@ -3447,21 +3454,15 @@ def get_swagger_json_download_link(api_display_name, env, api_path, apim_name):
     Returns:
         str: HTML link for downloading the JSON
     """
-    import base64
-    from datetime import datetime
-    
     # Generate the Swagger JSON
     swagger_json = generate_swagger_json(api_display_name, env, api_path, apim_name)
     
-    # Convert to base64 for download link
-    b64 = base64.b64encode(swagger_json.encode()).decode()
-    
     # Create filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     filename = f"anpi_swagger_{env.lower()}_{timestamp}.json"
     
     # Create HTML download link
-    href = f'<a href="data:application/json;base64,{b64}" download="{filename}" class="download-button">📥 Download Swagger/OpenAPI JSON</a>'
+    href = _data_url_link("application/json", swagger_json.encode(), filename, "📥 Download Swagger/OpenAPI JSON")
     
     return href
   
\ No newline at end of file